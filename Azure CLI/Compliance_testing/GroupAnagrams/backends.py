@@ -0,0 +1,142 @@
+import os
+from urllib.parse import quote
+
+import pandas as pd
+from openpyxl import Workbook
+
+
+class ExcelBackend:
+    """
+    One write-only worksheet per keyword plus the All sheet
+    """
+    # Cells keep the types pandas inferred for each chunk
+    input_dtype = None
+    # Rows are appended from pandas, so Arrow chunks are converted first
+    arrow_input = False
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self._wb = Workbook(write_only=True)
+        self._sheets = {}
+
+    def write(self, key, chunk):
+        # Sheets are created on first write, so keywords without data are skipped
+        sheet = self._sheets.get(key)
+        if sheet is None:
+            sheet = self._wb.create_sheet(title=key)
+            sheet.append(list(chunk.columns))
+            self._sheets[key] = sheet
+        # NaN becomes an empty cell
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+
+    def written(self, key):
+        return key in self._sheets
+
+    def close(self, keys=()):
+        # Sheets were created in order of first match; save them as All
+        # followed by the keyword order of config.json, like non-stream mode
+        order = [self._sheets[key] for key in dict.fromkeys(['All', *keys]) if key in self._sheets]
+        self._wb._sheets = order + [sheet for sheet in self._wb._sheets if sheet not in order]
+        self._wb.save(self.output_path)
+
+
+class CsvBackend:
+    """
+    One CSV file per keyword plus All.csv inside the output directory
+    """
+    input_dtype = None
+    # Arrow chunks are written with the Arrow CSV writer, without pandas
+    arrow_input = True
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        os.makedirs(output_path, exist_ok=True)
+        self._files = {}
+
+    def write(self, key, chunk):
+        f = self._files.get(key)
+        header = f is None
+        if header:
+            path = os.path.join(self.output_path, f"{quote(key, safe='')}.csv")
+            f = open(path, 'wb')
+            self._files[key] = f
+        if isinstance(chunk, pd.DataFrame):
+            chunk.to_csv(f, header=header, index=False, encoding='utf-8')
+        else:
+            import pyarrow.csv as pa_csv
+
+            # Arrow quotes every string value; the file reads back the same
+            pa_csv.write_csv(chunk, f, pa_csv.WriteOptions(include_header=header))
+
+    def written(self, key):
+        return key in self._files
+
+    def close(self, keys=()):
+        for f in self._files.values():
+            f.close()
+
+
+class ParquetBackend:
+    """
+    Hive-style partitioned dataset: groups/keyword=<key>/part-0.parquet,
+    with the complete export in all.parquet next to it
+    """
+    # Columns are read as strings so every chunk shares one Parquet schema
+    input_dtype = str
+    arrow_input = True
+
+    def __init__(self, output_path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self.output_path = output_path
+        os.makedirs(output_path, exist_ok=True)
+        self._writers = {}
+        self._schema = None
+
+    def _path(self, key):
+        if key == 'All':
+            return os.path.join(self.output_path, 'all.parquet')
+        # Same percent-encoding pyarrow uses when reading hive partition values
+        partition = os.path.join(self.output_path, 'groups', f"keyword={quote(key, safe='')}")
+        os.makedirs(partition, exist_ok=True)
+        return os.path.join(partition, 'part-0.parquet')
+
+    def write(self, key, chunk):
+        pa = self._pa
+        if isinstance(chunk, pd.DataFrame):
+            table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+        elif self._schema is not None:
+            table = chunk.cast(self._schema)
+        else:
+            table = chunk
+        if self._schema is None:
+            # A column empty for the whole first chunk is inferred as null;
+            # store it as string so later chunks with values still fit
+            fields = [field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                      for field in table.schema]
+            self._schema = pa.schema(fields, metadata=table.schema.metadata)
+            table = table.cast(self._schema)
+        writer = self._writers.get(key)
+        if writer is None:
+            writer = self._pq.ParquetWriter(self._path(key), self._schema)
+            self._writers[key] = writer
+        writer.write_table(table)
+
+    def written(self, key):
+        return key in self._writers
+
+    def close(self, keys=()):
+        for writer in self._writers.values():
+            writer.close()
+
+
+BACKENDS = {
+    'excel': ExcelBackend,
+    'csv': CsvBackend,
+    'parquet': ParquetBackend,
+}
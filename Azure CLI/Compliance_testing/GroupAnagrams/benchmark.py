@@ -0,0 +1,219 @@
+import argparse
+import contextlib
+import json
+import os
+import random
+import resource
+import string
+import sys
+import tempfile
+import threading
+import time
+
+from backends import BACKENDS
+from ingest import display_names, read_chunks_arrow, read_chunks_pandas, take_rows, to_frame
+from main import create_matcher
+from matcher import ParallelKeywordMatcher
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+
+def generate_export(path, rows, keyword_count, hit_rate, name_length, seed=0):
+    """
+    Write a synthetic directory export and return its keyword list
+
+    Keywords are uppercase and filler names lowercase, so a row matches
+    only when a keyword was deliberately inserted into its name.
+    """
+    rng = random.Random(seed)
+    keywords = list(dict.fromkeys(
+        ''.join(rng.choices(string.ascii_uppercase, k=rng.randint(3, 6)))
+        for _ in range(keyword_count)
+    ))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("DisplayName,UserPrincipalName,Mail,Department,AccountEnabled\n")
+        for i in range(rows):
+            name = ''.join(rng.choices(string.ascii_lowercase, k=name_length))
+            if rng.random() < hit_rate:
+                pos = rng.randint(0, name_length)
+                name = name[:pos] + rng.choice(keywords) + name[pos:]
+            f.write(f"{name},user{i}@contoso.cn,user{i}@contoso.cn,dept{i % 50},{i % 7 != 0}\n")
+    return keywords
+
+
+PHASES = ('read', 'match', 'write')
+
+
+def _rss_mb():
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        # Without /proc only the process-lifetime peak is available
+        # ru_maxrss is bytes on macOS, KiB elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+class PhaseMonitor:
+    """
+    Accumulates the time spent in each phase and the peak RSS seen while
+    it runs, sampled by a background thread, so phases that alternate
+    chunk by chunk are still measured separately
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.peaks = dict.fromkeys(PHASES, 0.0)
+        self._current = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        phase = self._current
+        if phase is not None:
+            self.peaks[phase] = max(self.peaks[phase], _rss_mb())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self._current = name
+        self._sample()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+            self._sample()
+            self._current = None
+
+    def results(self):
+        return {phase: {'seconds': round(self.seconds[phase], 3), 'peak_rss_mb': round(self.peaks[phase], 1)}
+                for phase in PHASES}
+
+
+def run_benchmark(input_path, keywords, output_path, fmt='excel', engine='pandas', workers=1, chunksize=None):
+    """
+    Time the read, match and write phases separately
+
+    Chunks stream through match and write one at a time as in main.group_export,
+    so a chunksize run keeps only one chunk in memory.
+    """
+    backend_cls = BACKENDS[fmt]
+    if engine == 'arrow':
+        chunks = read_chunks_arrow([input_path], chunksize)
+    else:
+        chunks = read_chunks_pandas([input_path], chunksize, backend_cls.input_dtype)
+
+    backend = backend_cls(output_path)
+    matcher = create_matcher(keywords, workers)
+    try:
+        with PhaseMonitor() as monitor:
+            while True:
+                with monitor.phase('read'):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                with monitor.phase('match'):
+                    matches = matcher.match_column(display_names(chunk))
+                with monitor.phase('write'):
+                    if not backend.arrow_input:
+                        chunk = to_frame(chunk)
+                    backend.write('All', chunk)
+                    for key, positions in matches.items():
+                        if len(positions):
+                            backend.write(key, take_rows(chunk, positions))
+                del chunk, matches
+            with monitor.phase('write'):
+                backend.close(keywords)
+    finally:
+        if isinstance(matcher, ParallelKeywordMatcher):
+            matcher.close()
+    return monitor.results()
+
+
+def compare(results, baseline, tolerance, memory_tolerance):
+    """
+    Return the phases that are slower, or use more memory, than baseline
+    by more than the given tolerances
+    """
+    regressions = []
+    for phase in PHASES:
+        if phase not in baseline:
+            continue
+        limit = baseline[phase]['seconds'] * (1 + tolerance)
+        if results[phase]['seconds'] > limit:
+            regressions.append(f"{phase}: {results[phase]['seconds']}s > {limit:.3f}s")
+        memory_limit = baseline[phase]['peak_rss_mb'] * (1 + memory_tolerance)
+        if results[phase]['peak_rss_mb'] > memory_limit:
+            regressions.append(f"{phase}: peak RSS {results[phase]['peak_rss_mb']} MB > {memory_limit:.1f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the keyword grouping pipeline on synthetic data")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--keywords', type=int, default=300)
+    parser.add_argument('--hit-rate', type=float, default=0.05)
+    parser.add_argument('--name-length', type=int, default=24)
+    parser.add_argument('--format', choices=sorted(BACKENDS), default='excel')
+    parser.add_argument('--engine', choices=['pandas', 'arrow'], default='pandas')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--chunksize', type=int, help="Benchmark chunked reads of this many rows")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Stored baseline results")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the baseline for its scenario")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown against the baseline")
+    parser.add_argument('--memory-tolerance', type=float, default=0.25,
+                        help="Allowed peak RSS growth against the baseline")
+    args = parser.parse_args()
+
+    scenario = (f"rows={args.rows},keywords={args.keywords},hit_rate={args.hit_rate},"
+                f"name_length={args.name_length},format={args.format},engine={args.engine},"
+                f"workers={args.workers},chunksize={args.chunksize}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'export.csv')
+        print(f"Generating {args.rows} rows with {args.keywords} keywords...")
+        keywords = generate_export(input_path, args.rows, args.keywords, args.hit_rate, args.name_length)
+        output_path = os.path.join(tmp, 'output.xlsx' if args.format == 'excel' else 'output')
+        results = run_benchmark(input_path, keywords, output_path, args.format, args.engine,
+                                args.workers, args.chunksize)
+
+    print(f"Scenario: {scenario}")
+    for phase in PHASES:
+        print(f"  {phase:<6} {results[phase]['seconds']:>8.3f}s  peak RSS {results[phase]['peak_rss_mb']} MB")
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    if args.save_baseline:
+        baselines[scenario] = results
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    elif scenario in baselines:
+        regressions = compare(results, baselines[scenario], args.tolerance, args.memory_tolerance)
+        if regressions:
+            print("Regression against baseline:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("Within baseline tolerance")
+    else:
+        print("No baseline stored for this scenario")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import csv
+import glob
+
+import pandas as pd
+
+
+def expand_inputs(patterns):
+    """
+    Expand input paths and glob patterns, keeping the given order
+    """
+    paths = []
+    for pattern in patterns:
+        matched = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matched:
+            raise FileNotFoundError(f"No input files match {pattern}")
+        paths.extend(matched)
+    return paths
+
+
+def _is_parquet(path):
+    return path.lower().endswith(('.parquet', '.parq'))
+
+
+def _projection(columns):
+    # DisplayName is always needed for matching
+    if columns and 'DisplayName' not in columns:
+        return ['DisplayName'] + list(columns)
+    return columns
+
+
+def read_chunks_pandas(paths, chunksize=None, dtype=None, columns=None):
+    """
+    Yield DataFrames from each input, whole or in chunks of chunksize rows
+    """
+    columns = _projection(columns)
+    for path in paths:
+        if _is_parquet(path):
+            df = pd.read_parquet(path, columns=columns)
+            if dtype is not None:
+                df = df.astype(dtype).where(df.notna())
+            yield df
+        elif chunksize:
+            yield from pd.read_csv(path, chunksize=chunksize, dtype=dtype, usecols=columns)
+        else:
+            yield pd.read_csv(path, dtype=dtype, usecols=columns)
+
+
+def _csv_header(path):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f))
+
+
+def _rebatch(batches, chunksize):
+    """
+    Group record batches into tables of about chunksize rows
+    """
+    import pyarrow as pa
+
+    pending, rows = [], 0
+    for batch in batches:
+        pending.append(batch)
+        rows += batch.num_rows
+        if rows >= chunksize:
+            yield pa.Table.from_batches(pending)
+            pending, rows = [], 0
+    if pending:
+        yield pa.Table.from_batches(pending)
+
+
+def read_chunks_arrow(paths, chunksize=None, columns=None):
+    """
+    Yield pyarrow Tables from each input using the multithreaded Arrow readers
+
+    CSV columns are read as strings: Arrow freezes column types after the
+    first block, so inferred numeric types could break on later rows.
+    Only the projected columns are parsed into memory.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    columns = _projection(columns)
+    for path in paths:
+        if _is_parquet(path):
+            if chunksize:
+                batches = pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns)
+                yield from (pa.Table.from_batches([batch]) for batch in batches)
+            else:
+                yield pq.read_table(path, columns=columns)
+            continue
+
+        convert_options = pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in _csv_header(path)},
+            include_columns=columns,
+            strings_can_be_null=True
+        )
+        if chunksize:
+            yield from _rebatch(pa_csv.open_csv(path, convert_options=convert_options), chunksize)
+        else:
+            yield pa_csv.read_csv(path, convert_options=convert_options)
+
+
+def display_names(chunk):
+    """
+    DisplayName column of a chunk as a pandas Series
+    """
+    if isinstance(chunk, pd.DataFrame):
+        return chunk['DisplayName']
+    return chunk.column('DisplayName').to_pandas()
+
+
+def to_frame(chunk):
+    """
+    Materialise a chunk as a DataFrame
+    """
+    if isinstance(chunk, pd.DataFrame):
+        return chunk
+    return chunk.to_pandas()
+
+
+def take_rows(chunk, positions):
+    """
+    Rows at positions, as a DataFrame or pyarrow Table like chunk
+    """
+    if isinstance(chunk, pd.DataFrame):
+        return chunk.iloc[positions]
+    return chunk.take(positions)
@@ -1,28 +1,90 @@
-import pandas as pd
+import argparse
 import json
+from backends import BACKENDS
+from ingest import display_names, expand_inputs, read_chunks_arrow, read_chunks_pandas, take_rows, to_frame
+from matcher import KeywordMatcher, ParallelKeywordMatcher
 
-df = pd.read_csv('input-path')
 
-config_path = 'config.json'
-with open(config_path, 'r') as f:
-    keywords = json.load(f)
+def load_config(config_path):
+    """
+    Load keywords and output options from config.json
 
-Dictionary = {key :[] for key in keywords}
+    The file is either a plain keyword list or
+    {"keywords": [...], "output": {"format": "excel|csv|parquet"}}
+    """
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    if isinstance(config, list):
+        return config, {}
+    return config["keywords"], config.get("output", {})
 
-for _,row in df.iterrows():
-    display_name = row['DisplayName']
-    for key in keywords:
-        if key in display_name:
-            Dictionary[key].append(row)
 
-import datetime
+def create_matcher(keywords, workers=1):
+    """
+    Compile the keyword list once, sharded over a process pool if workers > 1
+    """
+    if workers > 1:
+        return ParallelKeywordMatcher(keywords, workers)
+    return KeywordMatcher(keywords)
 
-output_path = f'output-path'
-with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-    df.to_excel(writer, sheet_name='All', index=False)
-    for key, rows in Dictionary.items():
-        if rows:
-            pd.DataFrame(rows).to_excel(writer, sheet_name=key, index=False)
+
+def group_export(chunks, matcher, backend):
+    """
+    Write every chunk to All and each matched slice to its keyword group
+    """
+    try:
+        for chunk in chunks:
+            # Arrow chunks reach the csv/parquet backends unconverted;
+            # only the DisplayName column becomes pandas for matching
+            if not backend.arrow_input:
+                chunk = to_frame(chunk)
+            backend.write('All', chunk)
+            # Scan DisplayName in a single pass
+            for key, positions in matcher.match_column(display_names(chunk)).items():
+                if len(positions):
+                    backend.write(key, take_rows(chunk, positions))
+    finally:
+        # Also on failure, so Parquet files written so far get their footer
+        backend.close(matcher.keywords)
+
+    for key in matcher.keywords:
+        if backend.written(key):
             print(f"successfully write {key} sheet")
         else:
-            print(f"no data for {key} sheet")
\ No newline at end of file
+            print(f"no data for {key} sheet")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Group directory accounts by keyword into an Excel workbook")
+    parser.add_argument('--input', nargs='+', default=['input-path'], help="Input CSV/Parquet files or glob patterns")
+    parser.add_argument('--output', default='output-path', help="Output .xlsx path, or directory for csv/parquet")
+    parser.add_argument('--config', default='config.json', help="Keyword list JSON file")
+    parser.add_argument('--format', choices=sorted(BACKENDS), help="Output backend, overrides config.json")
+    parser.add_argument('--stream', action='store_true', help="Chunked read with incremental writes (bounded memory)")
+    parser.add_argument('--chunksize', type=int, default=50000, help="Rows per chunk in streaming mode")
+    parser.add_argument('--engine', choices=['pandas', 'arrow'], default='pandas', help="CSV/Parquet reader")
+    parser.add_argument('--columns', nargs='+', help="Only read these columns (DisplayName is always read)")
+    parser.add_argument('--workers', type=int, default=1, help="Processes used for keyword matching")
+    args = parser.parse_args()
+
+    keywords, output = load_config(args.config)
+    backend_cls = BACKENDS[args.format or output.get("format", "excel")]
+    paths = expand_inputs(args.input)
+    chunksize = args.chunksize if args.stream else None
+    if args.engine == 'arrow':
+        chunks = read_chunks_arrow(paths, chunksize, args.columns)
+    else:
+        chunks = read_chunks_pandas(paths, chunksize, backend_cls.input_dtype, args.columns)
+
+    matcher = create_matcher(keywords, args.workers)
+    try:
+        # Created only once the inputs exist, so a bad --input leaves no output behind
+        backend = backend_cls(args.output)
+        group_export(chunks, matcher, backend)
+    finally:
+        if isinstance(matcher, ParallelKeywordMatcher):
+            matcher.close()
+
+
+if __name__ == "__main__":
+    main()
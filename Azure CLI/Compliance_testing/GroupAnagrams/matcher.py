@@ -0,0 +1,146 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton compiled once from the keyword list
+    """
+
+    def __init__(self, keywords):
+        # Keep config order, drop duplicates
+        self.keywords = list(dict.fromkeys(keywords))
+        # An empty keyword is a substring of every name, same as `'' in name`
+        self._always = tuple(i for i, key in enumerate(self.keywords) if key == '')
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for idx, key in enumerate(self.keywords):
+            if key:
+                self._add(key, idx)
+        self._build_failure_links()
+
+    def _add(self, key, idx):
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state] = self._out[state] + (idx,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                # Merge outputs so each state reports every keyword ending here
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def search(self, text):
+        """
+        Return the set of keyword indices contained in text
+        """
+        found = set(self._always)
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def match_column(self, values):
+        """
+        Scan a column once and return {keyword: array of matching row positions}
+        """
+        # Each distinct name is scanned once; repeated names share the result
+        codes, uniques = pd.factorize(pd.Series(values, copy=False))
+        hits = [[] for _ in self.keywords]
+        for code, name in enumerate(uniques):
+            if not isinstance(name, str):
+                continue
+            for idx in self.search(name):
+                hits[idx].append(code)
+
+        matches = {}
+        for key, unique_codes in zip(self.keywords, hits):
+            # Extra trailing slot keeps the -1 code of missing names unmatched
+            mask = np.zeros(len(uniques) + 1, dtype=bool)
+            mask[unique_codes] = True
+            matches[key] = np.flatnonzero(mask[codes])
+        return matches
+
+
+_worker_matcher = None
+
+
+def _init_worker(keywords):
+    global _worker_matcher
+    _worker_matcher = KeywordMatcher(keywords)
+
+
+def _match_shard(values):
+    return _worker_matcher.match_column(values)
+
+
+class ParallelKeywordMatcher:
+    """
+    Split a column into row shards and match them on a process pool
+    """
+
+    def __init__(self, keywords, workers):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.workers = workers
+        # Every worker compiles its own automaton once, shards only carry names
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.keywords,)
+        )
+
+    def match_column(self, values):
+        """
+        Same result as KeywordMatcher.match_column, computed shard by shard
+        """
+        values = pd.Series(values, copy=False)
+        # A few shards per worker keeps the pool busy when shards are uneven
+        shard_size = max(1, -(-len(values) // (self.workers * 4)))
+        offsets = range(0, len(values), shard_size)
+        shards = (values.iloc[start:start + shard_size] for start in offsets)
+
+        parts = {key: [] for key in self.keywords}
+        # map() yields in submission order, so positions stay in row order
+        for start, shard_matches in zip(offsets, self._pool.map(_match_shard, shards)):
+            for key, positions in shard_matches.items():
+                if len(positions):
+                    parts[key].append(positions + start)
+        return {
+            key: np.concatenate(chunks) if chunks else np.empty(0, dtype=np.intp)
+            for key, chunks in parts.items()
+        }
+
+    def close(self):
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
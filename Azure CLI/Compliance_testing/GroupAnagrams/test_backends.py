@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+import pyarrow.parquet as pq
+
+from openpyxl import load_workbook
+
+from backends import ExcelBackend, ParquetBackend
+from main import group_export
+from matcher import KeywordMatcher
+
+
+def test_parquet_column_empty_in_first_chunk(tmp_path):
+    # read_csv(dtype=str) on pandas 2 gives object columns; an all-empty one infers as Arrow null
+    first = pd.DataFrame({'DisplayName': ['a', 'b'], 'Dept': [None, None]}, dtype=object)
+    second = pd.DataFrame({'DisplayName': ['c'], 'Dept': ['Finance']}, dtype=object)
+
+    backend = ParquetBackend(str(tmp_path))
+    backend.write('All', first)
+    backend.write('All', second)
+    backend.close()
+
+    table = pq.read_table(tmp_path / 'all.parquet')
+    assert table.column('Dept').to_pylist() == [None, None, 'Finance']
+
+
+def test_excel_sheets_follow_keyword_order(tmp_path):
+    # In stream mode the later keyword may match in an earlier chunk
+    path = tmp_path / 'groups.xlsx'
+    backend = ExcelBackend(str(path))
+    backend.write('All', pd.DataFrame({'DisplayName': ['b1', 'a1']}))
+    backend.write('b', pd.DataFrame({'DisplayName': ['b1']}))
+    backend.write('a', pd.DataFrame({'DisplayName': ['a1']}))
+    backend.close(['a', 'b', 'c'])
+
+    assert load_workbook(path, read_only=True).sheetnames == ['All', 'a', 'b']
+
+
+def test_parquet_readable_after_failed_export(tmp_path):
+    def chunks():
+        yield pd.DataFrame({'DisplayName': ['sales a', 'hr b']}, dtype=object)
+        raise ValueError("bad input file")
+
+    backend = ParquetBackend(str(tmp_path))
+    with pytest.raises(ValueError):
+        group_export(chunks(), KeywordMatcher(['sales']), backend)
+
+    assert pq.read_table(tmp_path / 'all.parquet').num_rows == 2
+    assert pq.read_table(tmp_path / 'groups').num_rows == 1
@@ -6,199 +6,187 @@ import asyncio
 import hashlib
 import hmac
 import base64
-import requests
-from azure.identity import ClientSecretCredential, AzureAuthorityHosts
-from msgraph import GraphServiceClient
-from dateutil.parser import parse
+import gzip
+import random
+import time
+import textwrap
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def get_azure_credentials(config):
+# Shared client module lives one level up, next to both checker variants.
+# These modules import the Azure SDKs only when going online, so --help,
+# validation and offline commands start quickly.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from applications import iter_application_source
+from azure_clients import get_azure_credentials, create_batch_client, create_tenant_graph_client, get_http_session
+from checker_cli import add_command, build_parser, check_config, describe_scan, load_config
+from credential_store import open_history_store, print_history_summary
+from credential_records import CredentialRecord, run_clock
+from graph_lookups import iter_app_records
+from tenants import scan_tenants
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(SCRIPT_DIR, 'config.json')
+
+def expiring_apps_path(output_dir=None):
     """
-    Get Azure credentials from configuration file
+    Timestamped path for the expiring applications JSON artifact
     """
-    tenant_id = config["azure"]["tenant_id"]
-    client_id = config["azure"]["client_id"]
-    client_secret = config["azure"]["client_secret"]
-    
-    if not all([tenant_id, client_id, client_secret]):
-        print("Error: Missing Azure credential configuration, please check config.json file")
-        sys.exit(1)
-        
-    # Use ClientSecretCredential and specify Azure China cloud authority
-    try:
-        credential = ClientSecretCredential(
-            tenant_id=tenant_id,
-            client_id=client_id,
-            client_secret=client_secret,
-            authority=AzureAuthorityHosts.AZURE_CHINA  # Specify China cloud authority
-        )
-        return credential
-    except Exception as e:
-        print(f"Error creating Azure credentials: {str(e)}")
-        sys.exit(1)
+    if output_dir is None:
+        output_dir = SCRIPT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(output_dir, f"expiring_apps_{timestamp}.json")
 
-async def get_app_registrations(credentials, config):
+# Data Collector API accepts at most 30 MB per post; stay well below it
+MAX_BATCH_BYTES = 25 * 1024 * 1024
+# Status codes worth retrying: throttling and transient server errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+class BatchBuffer:
     """
-    Get all application registration information
+    Collects JSON-encoded records for one upload body of at most max_bytes
     """
-    try:
-        # Define Graph API scopes
-        scopes = ['https://microsoftgraph.chinacloudapi.cn/.default']  # Use China cloud Graph scope
-        
-        # Initialize GraphServiceClient for Azure China
-        graph_client = GraphServiceClient(
-            credentials=credentials,
-            scopes=scopes
-        )
-        
-        graph_client.request_adapter.base_url = "https://microsoftgraph.chinacloudapi.cn/v1.0"
 
-        # Get applications - use await keyword to wait for async operation
-        result = await graph_client.applications.get()
-        
-        app_info = []
-        if hasattr(result, 'value'):
-            for app in result.value:
-                passwords = app.password_credentials if hasattr(app, 'password_credentials') else []
-                
-                created_time_str = "Unknown"
-                if hasattr(app, 'created_date_time') and app.created_date_time:
-                    # Ensure created_date_time is timezone aware
-                    created_dt = app.created_date_time
-                    if hasattr(created_dt, 'replace'):
-                        created_dt_aware = created_dt.replace(tzinfo=datetime.timezone.utc).astimezone(tz=None)
-                        created_time_str = created_dt_aware.strftime("%Y-%m-%d %H:%M:%S")
-                
-                if not passwords:
-                    app_info.append({
-                        "display_name": app.display_name if hasattr(app, 'display_name') else 'N/A',
-                        "app_id": app.app_id if hasattr(app, 'app_id') else 'N/A',
-                        "created_time": created_time_str,
-                        "password": "None",
-                        "end_date": "None",
-                        "days_to_expire": "N/A"
-                    })
-                else:
-                    for pwd in passwords:
-                        end_date_str = "Unknown"
-                        days_to_expire = "Unknown"
-                        
-                        if hasattr(pwd, 'end_date_time') and pwd.end_date_time:
-                            end_dt = pwd.end_date_time
-                            if hasattr(end_dt, 'replace'):
-                                end_dt_aware = end_dt.replace(tzinfo=datetime.timezone.utc)
-                                now_aware = datetime.datetime.now(datetime.timezone.utc)
-                                days_to_expire = (end_dt_aware - now_aware).days
-                                end_date_str = end_dt_aware.astimezone(tz=None).strftime("%Y-%m-%d %H:%M:%S")
-                        
-                        app_info.append({
-                            "display_name": app.display_name if hasattr(app, 'display_name') else 'N/A',
-                            "app_id": app.app_id if hasattr(app, 'app_id') else 'N/A',
-                            "created_time": created_time_str,
-                            "password": "Password" if hasattr(pwd, 'key_id') and pwd.key_id else "None",
-                            "end_date": end_date_str,
-                            "days_to_expire": days_to_expire
-                        })
-        
-        return app_info
-    except Exception as e:
-        print(f"Error getting application registration information: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return []
+    def __init__(self, max_bytes=MAX_BATCH_BYTES):
+        self.max_bytes = max_bytes
+        self.items, self.size = [], 2  # the surrounding []
+
+    def add(self, row):
+        """
+        Add one record dict; returns the items of the full batch when the
+        record had to start a new one, otherwise None
+        """
+        item = json.dumps(row).encode('utf-8')
+        full = None
+        # +1 for the separating comma
+        if self.items and self.size + len(item) + 1 > self.max_bytes:
+            full = self.flush()
+        self.items.append(item)
+        self.size += len(item) + 1
+        return full
+
+    def flush(self):
+        items = self.items
+        self.items, self.size = [], 2
+        return items
 
-def save_expiring_apps_to_json(app_info, output_dir=None):
+def batch_body(items):
+    return b'[' + b','.join(items) + b']'
+
+def build_batches(rows, max_bytes=MAX_BATCH_BYTES):
     """
-    Save applications with expiring credentials (<30 days) to JSON file
+    Split rows (record dicts, as saved in the JSON file) into (count, body)
+    JSON array bodies of at most max_bytes each, for the upload command
     """
-    # Filter applications with credentials expiring within 30 days
-    expiring_apps = []
-    for app in app_info:
-        days = app["days_to_expire"]
-        if isinstance(days, int) and days <= 30:
-            expiring_apps.append(app)
-    
-    if not expiring_apps:
-        print("No applications with credentials expiring within 30 days found")
-        return False, []
-    
-    # Determine output directory
-    if output_dir is None:
-        output_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Create filename with timestamp
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = os.path.join(output_dir, f"expiring_apps_{timestamp}.json")
-    
-    # Save data to JSON file
-    try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            # Convert datetime objects to strings for JSON serialization
-            json_data = []
-            for app in expiring_apps:
-                app_copy = app.copy()
-                json_data.append(app_copy)
-            
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
-        
-        print(f"Saved {len(expiring_apps)} applications with expiring credentials to: {output_file}")
-        return True, expiring_apps
-    except Exception as e:
-        print(f"Error saving JSON file: {str(e)}")
-        return False, []
+    buffer = BatchBuffer(max_bytes)
+    batches = [items for items in map(buffer.add, rows) if items]
+    if buffer.items:
+        batches.append(buffer.flush())
+    return [(len(items), batch_body(items)) for items in batches]
 
-def upload_to_log_analytics(expiring_apps, config):
+def post_batch(body, workspace_id, shared_key, log_type, compress=False, max_retries=5, endpoint=None):
     """
-    Upload expiring applications data to Azure Log Analytics workspace
+    Post one batch, retrying throttled and transient failures with backoff.
+    endpoint replaces the workspace's ingestion host, e.g. for a local mock.
+    Returns (success, status or error message, attempts)
+    """
+    import requests
+
+    method = 'POST'
+    content_type = 'application/json'
+    resource = '/api/logs'
+    endpoint = endpoint or f'https://{workspace_id}.ods.opinsights.azure.cn'
+    uri = f'{endpoint}{resource}?api-version=2016-04-01'
+    if compress:
+        body = gzip.compress(body)
+
+    status = None
+    for attempt in range(1, max_retries + 2):
+        # The signature covers the date, so it is rebuilt for every attempt
+        rfc1123date = datetime.datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
+        signature = build_signature(
+            workspace_id, shared_key, rfc1123date, len(body), method, content_type, resource
+        )
+        headers = {
+            'content-type': content_type,
+            'Authorization': signature,
+            'Log-Type': log_type,
+            'x-ms-date': rfc1123date
+        }
+        if compress:
+            headers['Content-Encoding'] = 'gzip'
+
+        retry_after = None
+        try:
+            # Pooled session keeps the TLS connection alive between upload requests
+            response = get_http_session().post(uri, data=body, headers=headers, timeout=60)
+            status = response.status_code
+            if 200 <= status <= 299:
+                return True, status, attempt
+            if status not in RETRYABLE_STATUS:
+                return False, f"{status} {response.reason}", attempt
+            retry_after = response.headers.get('Retry-After')
+        except requests.exceptions.RequestException as e:
+            status = str(e)
+
+        if attempt <= max_retries:
+            # Honour Retry-After when given, otherwise exponential backoff with jitter
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else min(60, 2 ** attempt)
+            time.sleep(delay + random.uniform(0, 1))
+    return False, status, max_retries + 1
+
+def upload_to_log_analytics(expiring_apps, config, dry_run=False):
+    """
+    Upload expiring applications data (record dicts, as saved in the JSON
+    file) to Azure Log Analytics workspace in size-bounded batches sent
+    concurrently. A dry run only reports the batches.
     """
     # Check if Log Analytics configuration exists
     if "log_analytics" not in config or not config["log_analytics"]:
         print("Log Analytics configuration not found in config.json, skipping upload")
         return False
     
-    workspace_id = config["log_analytics"].get("workspace_id")
-    shared_key = config["log_analytics"].get("shared_key")
-    log_type = config["log_analytics"].get("log_type", "AppRegistrationExpiry")
+    la_config = config["log_analytics"]
+    workspace_id = la_config.get("workspace_id")
+    shared_key = la_config.get("shared_key")
+    log_type = la_config.get("log_type", "AppRegistrationExpiry")
     
     if not workspace_id or not shared_key:
         print("Error: Missing Log Analytics workspace ID or shared key in configuration")
         return False
     
-    # Format the data for Log Analytics
-    body = json.dumps(expiring_apps)
+    batches = build_batches(expiring_apps, la_config.get("max_batch_bytes", MAX_BATCH_BYTES))
+    if dry_run:
+        for index, (count, body) in enumerate(batches, start=1):
+            print(f"Batch {index}/{len(batches)}: {count} records, {len(body)} bytes (not sent)")
+        return True
+    max_parallel = la_config.get("max_parallel", 4)
     
-    # Build the API signature
-    method = 'POST'
-    content_type = 'application/json'
-    resource = '/api/logs'
-    rfc1123date = datetime.datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
-    content_length = len(body)
-    signature = build_signature(
-        workspace_id, shared_key, rfc1123date, content_length, method, content_type, resource
-    )
-    
-    uri = f'https://{workspace_id}.ods.opinsights.azure.cn{resource}?api-version=2016-04-01'
-    
-    headers = {
-        'content-type': content_type,
-        'Authorization': signature,
-        'Log-Type': log_type,
-        'x-ms-date': rfc1123date
-    }
+    uploaded = 0
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        futures = {
+            executor.submit(
+                post_batch, body, workspace_id, shared_key, log_type,
+                la_config.get("compress", False), la_config.get("max_retries", 5), la_config.get("endpoint")
+            ): (index, count)
+            for index, (count, body) in enumerate(batches, start=1)
+        }
+        for future in as_completed(futures):
+            index, count = futures[future]
+            success, status, attempts = future.result()
+            if success:
+                uploaded += count
+                print(f"Batch {index}/{len(batches)}: uploaded {count} records (attempts: {attempts})")
+            else:
+                failed += count
+                print(f"Batch {index}/{len(batches)}: error uploading {count} records: {status} (attempts: {attempts})")
     
-    try:
-        response = requests.post(uri, data=body, headers=headers)
-        if response.status_code >= 200 and response.status_code <= 299:
-            print(f"Successfully uploaded {len(expiring_apps)} records to Log Analytics workspace")
-            return True
-        else:
-            print(f"Error uploading to Log Analytics: {response.status_code} {response.reason}")
-            return False
-    except Exception as e:
-        print(f"Exception during upload to Log Analytics: {str(e)}")
+    if failed:
+        print(f"Uploaded {uploaded} records, {failed} records failed to upload to Log Analytics workspace")
         return False
+    print(f"Successfully uploaded {uploaded} records to Log Analytics workspace")
+    return True
 
 def build_signature(workspace_id, shared_key, date, content_length, method, content_type, resource):
     """
@@ -212,53 +200,242 @@ def build_signature(workspace_id, shared_key, date, content_length, method, cont
     authorization = f"SharedKey {workspace_id}:{encoded_hash.decode('utf-8')}"
     return authorization
 
-async def async_main():
+# Bounded queues between pipeline stages apply backpressure to the Graph fetch
+PIPELINE_QUEUE_SIZE = 1000
+
+async def fetch_stage(config, queues, now, store=None):
     """
-    Async main function
+    Producer for one tenant: fetch applications from Graph, transform them
+    into records and hand expiring ones to every consumer queue.
+    Records are held until the tenant's scan completes, so a tenant that
+    fails partway is neither uploaded nor written to history, as in mailcheck.
     """
-    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
-    
+    warning_days = config.get("warning_days", 30)
+    records = []
+    async with get_azure_credentials(config) as credentials:
+        graph_client = create_tenant_graph_client(credentials, config)
+        applications = iter_application_source(graph_client, config, SCRIPT_DIR)
+        async with create_batch_client(config) as batch_client:
+            async for record in iter_app_records(credentials, batch_client, applications, now, config):
+                records.append(record)
+    if store:
+        store.add_credentials(records)
+    for record in records:
+        if record.is_expiring(warning_days):
+            for queue in queues:
+                await queue.put(record)
+    return len(records)
+
+async def json_writer_stage(queue, output_dir=None):
+    """
+    Consumer: stream expiring records into the JSON artifact as they arrive
+    """
+    f = None
+    count = 0
+    finished = False
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: Configuration file not found at {config_path}")
-        return
-    except json.JSONDecodeError as e:
-        print(f"Error decoding configuration file {config_path}: {str(e)}")
-        return
+        while (record := await queue.get()) is not None:
+            # The file is only created once there is something to save
+            if f is None:
+                output_file = expiring_apps_path(output_dir)
+                f = open(output_file, 'w', encoding='utf-8')
+                f.write('[\n')
+            else:
+                f.write(',\n')
+            f.write(textwrap.indent(json.dumps(record.to_dict(), ensure_ascii=False, indent=2), '  '))
+            count += 1
+        # The sentinel has been consumed; nothing is left to drain after this
+        finished = True
+        if f is not None:
+            f.write('\n]')
+            print(f"Saved {count} applications with expiring credentials to: {output_file}")
     except Exception as e:
-        print(f"Error loading configuration file: {str(e)}")
-        return
+        print(f"Error saving JSON file: {str(e)}")
+        # Keep draining so the producer is never blocked on a full queue
+        while not finished and await queue.get() is not None:
+            pass
+    finally:
+        if f is not None:
+            f.close()
+    return count
+
+async def upload_stage(queue, config):
+    """
+    Consumer: cut expiring records into size-bounded batches and post them to
+    Log Analytics off the event loop, at most max_parallel at a time
+    """
+    la_config = config.get("log_analytics") or {}
+    workspace_id = la_config.get("workspace_id")
+    shared_key = la_config.get("shared_key")
+    if not workspace_id or not shared_key:
+        print("Log Analytics workspace ID or shared key not configured, skipping upload")
+        while await queue.get() is not None:
+            pass
+        return None
     
-    credentials = get_azure_credentials(config)
-    if not credentials:
-        return  # Exit if credentials fail
+    log_type = la_config.get("log_type", "AppRegistrationExpiry")
+    max_bytes = la_config.get("max_batch_bytes", MAX_BATCH_BYTES)
+    slots = asyncio.Semaphore(la_config.get("max_parallel", 4))
+    tasks = []
     
-    print("Getting Azure application registration information...")
-    app_info = await get_app_registrations(credentials, config)  # Use await to wait for async function
+    async def send(index, items):
+        body = batch_body(items)
+        try:
+            success, status, attempts = await asyncio.to_thread(
+                post_batch, body, workspace_id, shared_key, log_type,
+                la_config.get("compress", False), la_config.get("max_retries", 5), la_config.get("endpoint")
+            )
+        finally:
+            slots.release()
+        if success:
+            print(f"Batch {index}: uploaded {len(items)} records (attempts: {attempts})")
+        else:
+            print(f"Batch {index}: error uploading {len(items)} records: {status} (attempts: {attempts})")
+        return success, len(items)
     
-    if not app_info:
-        print("No application registration information found or error occurred during retrieval")
+    async def flush(items):
+        # Waiting for a free slot here pushes back on the queue instead of piling up batches
+        await slots.acquire()
+        tasks.append(asyncio.create_task(send(len(tasks) + 1, items)))
+    
+    buffer = BatchBuffer(max_bytes)
+    while (record := await queue.get()) is not None:
+        full = buffer.add(record.to_dict())
+        if full:
+            await flush(full)
+    if buffer.items:
+        await flush(buffer.flush())
+    
+    results = await asyncio.gather(*tasks)
+    uploaded = sum(count for success, count in results if success)
+    failed = sum(count for success, count in results if not success)
+    if failed:
+        print(f"Uploaded {uploaded} records, {failed} records failed to upload to Log Analytics workspace")
+    elif uploaded:
+        print(f"Successfully uploaded {uploaded} records to Log Analytics workspace")
+    return not failed
+
+async def run_pipeline(config):
+    """
+    Run fetch (one producer per tenant), JSON writing and upload concurrently,
+    connected by bounded queues
+    """
+    json_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    upload_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    queues = [json_queue, upload_queue]
+    now = run_clock()
+    store = open_history_store(config, SCRIPT_DIR)
+    if store:
+        store.begin_run(now)
+    
+    async def produce():
+        try:
+            return await scan_tenants(config, lambda tenant_config: fetch_stage(tenant_config, queues, now, store))
+        finally:
+            # Sentinel: consumers finish whatever they have buffered
+            for queue in queues:
+                await queue.put(None)
+    
+    try:
+        results, saved, _ = await asyncio.gather(
+            produce(),
+            json_writer_stage(json_queue, config.get("output_dir")),
+            upload_stage(upload_queue, config)
+        )
+        if store:
+            print_history_summary(store, config.get("warning_days", 30))
+    finally:
+        if store:
+            store.close()
+    total = sum(count for count in results.values() if count)
+    return total, saved
+
+def load_snapshot(path):
+    """
+    Records saved by a scan (the expiring applications JSON file), as dicts
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def print_snapshot_report(rows, warning_days=30):
+    """
+    Offline summary of a saved snapshot; days to expire are recomputed for today
+    """
+    now = run_clock()
+    records = sorted((CredentialRecord.from_dict(row, now) for row in rows), key=CredentialRecord.sort_key)
+    expired = sum(1 for record in records if record.days_to_expire is not None and record.days_to_expire < 0)
+    expiring = sum(1 for record in records if record.is_expiring(warning_days)) - expired
+    print(f"{len(records)} credentials: {expired} expired, {expiring} expiring within {warning_days} days")
+    for record in records:
+        app = record.to_dict()
+        print(f"  {app['days_to_expire']:>7}  {app['end_date']}  {app['password']:<11} {app['display_name']} ({app['app_id']})")
+
+async def scan(config, dry_run=False):
+    """
+    Fetch, save and upload expiring credentials for every configured tenant
+    """
+    if dry_run:
+        describe_scan(config)
+        la_config = config.get("log_analytics") or {}
+        target = la_config.get("endpoint") or la_config.get("workspace_id") or "not configured, skipped"
+        print(f"Log Analytics upload: {target}")
         return
     
-    print(f"Found {len(app_info)} application registrations, checking for expiring client secrets...")
+    print("Getting Azure application registration information and uploading expiring credentials...")
+    total, saved = await run_pipeline(config)
     
-    # Save expiring applications to JSON file and get the list of expiring apps
-    saved, expiring_apps = save_expiring_apps_to_json(app_info)
+    if not total:
+        print("No application registration information found or error occurred during retrieval")
+        return
     
-    # Upload to Log Analytics if there are expiring apps
-    if saved and expiring_apps:
-        print("Uploading expiring applications data to Azure Log Analytics...")
-        upload_to_log_analytics(expiring_apps, config)
+    print(f"Checked {total} application credentials")
+    if not saved:
+        print(f"No applications with credentials expiring within {config.get('warning_days', 30)} days found")
     
     print("Processing complete")
 
+def parse_args(argv=None):
+    parser, commands = build_parser(
+        "Check Azure application registration credentials and upload expiring ones to Log Analytics",
+        CONFIG_PATH
+    )
+    add_command(commands, "scan", "Scan the tenants, save and upload expiring credentials (default)")
+    report = add_command(commands, "report", "Summarise a saved expiring applications JSON file offline")
+    report.add_argument("snapshot", help="expiring_apps_*.json written by a scan")
+    upload = add_command(commands, "upload", "Upload a saved expiring applications JSON file to Log Analytics")
+    upload.add_argument("snapshot", help="expiring_apps_*.json written by a scan")
+    return parser.parse_args(argv)
+
+async def async_main(args):
+    """
+    Async main function
+    """
+    config = load_config(args.config)
+    if config is None:
+        return 1
+    
+    if args.command == "report":
+        print_snapshot_report(load_snapshot(args.snapshot), config.get("warning_days", 30))
+        return 0
+    
+    if args.command == "upload":
+        if not check_config(config, ("log_analytics",)):
+            return 1
+        rows = load_snapshot(args.snapshot)
+        print(f"Uploading {len(rows)} records from {args.snapshot}...")
+        return 0 if upload_to_log_analytics(rows, config, args.dry_run) else 1
+    
+    if not check_config(config):
+        return 1
+    await scan(config, args.dry_run)
+    return 0
+
 def main():
     """
-    Main function - start async run
+    Main function - parse the command line and start async run
     """
-    asyncio.run(async_main())
+    args = parse_args()
+    sys.exit(asyncio.run(async_main(args)))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
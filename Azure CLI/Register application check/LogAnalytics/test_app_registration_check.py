@@ -0,0 +1,75 @@
+import asyncio
+import io
+
+import pytest
+
+import app_registration_check
+from app_registration_check import fetch_stage, json_writer_stage
+
+
+class Record:
+    def __init__(self, name):
+        self.name = name
+
+    def to_dict(self):
+        return {'displayName': self.name}
+
+    def is_expiring(self, warning_days):
+        return True
+
+
+class AsyncResource:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+class Store:
+    def __init__(self):
+        self.records = []
+
+    def add_credentials(self, records):
+        self.records.extend(records)
+
+
+class FailingClose(io.StringIO):
+    def write(self, text):
+        # The closing bracket is only written after the sentinel was consumed
+        if text == '\n]':
+            raise OSError('disk full')
+        return super().write(text)
+
+
+def test_json_writer_returns_when_final_write_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_registration_check, 'open', lambda *args, **kwargs: FailingClose(),
+                        raising=False)
+
+    async def run():
+        queue = asyncio.Queue()
+        for name in ('app-a', 'app-b'):
+            await queue.put(Record(name))
+        await queue.put(None)
+        return await asyncio.wait_for(json_writer_stage(queue, str(tmp_path)), timeout=5)
+
+    assert asyncio.run(run()) == 2
+
+
+def test_fetch_stage_drops_tenant_that_fails_partway(monkeypatch):
+    async def iter_app_records(*args):
+        yield Record('app-a')
+        raise RuntimeError('Graph unavailable')
+
+    monkeypatch.setattr(app_registration_check, 'get_azure_credentials', lambda config: AsyncResource())
+    monkeypatch.setattr(app_registration_check, 'create_tenant_graph_client', lambda *args: None)
+    monkeypatch.setattr(app_registration_check, 'iter_application_source', lambda *args: None)
+    monkeypatch.setattr(app_registration_check, 'create_batch_client', lambda config: AsyncResource())
+    monkeypatch.setattr(app_registration_check, 'iter_app_records', iter_app_records)
+    queue = asyncio.Queue()
+    store = Store()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(fetch_stage({}, [queue], None, store))
+    assert queue.empty()
+    assert store.records == []
@@ -0,0 +1,186 @@
+"""
+Application enumeration shared by the app registration checkers: full paging
+with $select, or incremental sync through applications/delta with a local snapshot
+"""
+import os
+import json
+import asyncio
+from types import SimpleNamespace
+
+# Only the properties the report needs, and the largest page Graph allows for applications
+APPLICATION_SELECT = ["id", "displayName", "appId", "createdDateTime", "passwordCredentials", "keyCredentials"]
+APPLICATION_PAGE_SIZE = 999
+
+async def iter_applications(graph_client):
+    """
+    Yield every application, following @odata.nextLink page by page.
+    The next page is requested before the current one is handed out,
+    so processing overlaps the network round trip.
+    """
+    from msgraph.generated.applications.applications_request_builder import ApplicationsRequestBuilder
+    from kiota_abstractions.base_request_configuration import RequestConfiguration
+
+    query_params = ApplicationsRequestBuilder.ApplicationsRequestBuilderGetQueryParameters(
+        select=APPLICATION_SELECT,
+        top=APPLICATION_PAGE_SIZE
+    )
+    page = await graph_client.applications.get(
+        request_configuration=RequestConfiguration(query_parameters=query_params)
+    )
+    next_page = None
+    try:
+        while page:
+            next_link = page.odata_next_link
+            # nextLink already carries $select and $top
+            next_page = asyncio.ensure_future(graph_client.applications.with_url(next_link).get()) if next_link else None
+            for app in page.value or []:
+                yield app
+            page = await next_page if next_page else None
+    finally:
+        if next_page and not next_page.done():
+            next_page.cancel()
+
+# Delta token and credential snapshot kept between incremental runs
+DELTA_STATE_FILE = 'delta_state.json'
+
+def load_delta_state(state_path):
+    """
+    Load the saved delta link and application snapshot, or start empty
+    """
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"delta_link": None, "apps": {}}
+
+def save_delta_state(state, state_path):
+    """
+    Write the delta state atomically so an interrupted run keeps the old one
+    """
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+def merge_delta_application(apps, app):
+    """
+    Apply one delta record to the snapshot. Updated objects may carry only
+    the changed properties, so unset (None) fields keep their saved value.
+    """
+    if app.additional_data and "@removed" in app.additional_data:
+        apps.pop(app.id, None)
+        return
+    record = apps.setdefault(app.id, {
+        "display_name": None,
+        "app_id": None,
+        "created_date_time": None,
+        "password_credentials": [],
+        "key_credentials": []
+    })
+    if app.display_name is not None:
+        record["display_name"] = app.display_name
+    if app.app_id is not None:
+        record["app_id"] = app.app_id
+    if app.created_date_time is not None:
+        record["created_date_time"] = app.created_date_time.isoformat()
+    if app.password_credentials is not None:
+        record["password_credentials"] = [
+            {
+                "key_id": str(pwd.key_id) if pwd.key_id else None,
+                "end_date_time": pwd.end_date_time.isoformat() if pwd.end_date_time else None
+            }
+            for pwd in app.password_credentials
+        ]
+    if app.key_credentials is not None:
+        record["key_credentials"] = [
+            {
+                "key_id": str(cert.key_id) if cert.key_id else None,
+                "end_date_time": cert.end_date_time.isoformat() if cert.end_date_time else None
+            }
+            for cert in app.key_credentials
+        ]
+
+async def sync_applications_delta(graph_client, state):
+    """
+    Bring the snapshot up to date through applications/delta.
+    Without a saved delta link this is a full initial sync.
+    """
+    from msgraph.generated.applications.delta.delta_request_builder import DeltaRequestBuilder
+    from kiota_abstractions.base_request_configuration import RequestConfiguration
+
+    delta = graph_client.applications.delta
+    if state.get("delta_link"):
+        page = await delta.with_url(state["delta_link"]).get()
+    else:
+        query_params = DeltaRequestBuilder.DeltaRequestBuilderGetQueryParameters(select=APPLICATION_SELECT)
+        page = await delta.get(request_configuration=RequestConfiguration(query_parameters=query_params))
+    changes = 0
+    while page:
+        for app in page.value or []:
+            merge_delta_application(state["apps"], app)
+            changes += 1
+        if page.odata_next_link:
+            page = await delta.with_url(page.odata_next_link).get()
+        else:
+            state["delta_link"] = page.odata_delta_link
+            break
+    return changes
+
+def delta_state_path(config, base_dir):
+    """
+    Delta state file for this (tenant) config, relative to base_dir (the checker's directory)
+    """
+    return os.path.join(base_dir, config.get("delta_state_file") or DELTA_STATE_FILE)
+
+async def iter_applications_delta(graph_client, state_path):
+    """
+    Sync the local snapshot and yield its applications; days_to_expire is
+    recomputed locally from the stored end dates on every run
+    """
+    from kiota_abstractions.api_error import APIError
+    from dateutil.parser import parse
+
+    state = load_delta_state(state_path)
+    try:
+        changes = await sync_applications_delta(graph_client, state)
+    except APIError as e:
+        # 410 Gone: the delta token expired, start over with a full sync
+        if e.response_status_code != 410:
+            raise
+        print("Delta token expired, running a full sync")
+        state = {"delta_link": None, "apps": {}}
+        changes = await sync_applications_delta(graph_client, state)
+    save_delta_state(state, state_path)
+    print(f"Applied {changes} application changes, {len(state['apps'])} applications in snapshot")
+
+    for object_id, record in state["apps"].items():
+        yield SimpleNamespace(
+            id=object_id,
+            display_name=record["display_name"],
+            app_id=record["app_id"],
+            created_date_time=parse(record["created_date_time"]) if record["created_date_time"] else None,
+            password_credentials=[
+                SimpleNamespace(
+                    key_id=pwd["key_id"],
+                    end_date_time=parse(pwd["end_date_time"]) if pwd["end_date_time"] else None
+                )
+                for pwd in record["password_credentials"]
+            ],
+            # Snapshots written before certificates were tracked have no key_credentials
+            key_credentials=[
+                SimpleNamespace(
+                    key_id=cert["key_id"],
+                    end_date_time=parse(cert["end_date_time"]) if cert["end_date_time"] else None
+                )
+                for cert in record.get("key_credentials", [])
+            ]
+        )
+
+def iter_application_source(graph_client, config, base_dir):
+    """
+    Full enumeration, or only changes since the saved delta link for incremental runs;
+    the delta state is kept in base_dir
+    """
+    if config.get("incremental"):
+        return iter_applications_delta(graph_client, delta_state_path(config, base_dir))
+    return iter_applications(graph_client)
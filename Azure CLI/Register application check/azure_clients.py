@@ -0,0 +1,190 @@
+"""
+Shared Azure China clients for the app registration checkers:
+credentials with a persistent token cache and pooled, rate-limited HTTP transports.
+The Azure SDKs and HTTP libraries are imported by the functions that use them,
+so importing this module stays cheap for commands that never go online.
+"""
+import sys
+import asyncio
+
+GRAPH_HOST = "microsoftgraph.chinacloudapi.cn"
+GRAPH_BASE_URL = f"https://{GRAPH_HOST}/v1.0"
+GRAPH_SCOPES = [f"https://{GRAPH_HOST}/.default"]  # Use China cloud Graph scope
+
+# Connections kept open per host, shared by every request of the run
+MAX_CONNECTIONS = 20
+
+# Graph JSON batching accepts at most 20 sub-requests per call
+GRAPH_BATCH_SIZE = 20
+
+_http_session = None
+
+def get_azure_credentials(config):
+    """
+    Get Azure credentials from configuration file.
+    With config["token_cache"]["enabled"], tokens are kept in an encrypted
+    on-disk cache, so runs within a token's lifetime skip sign-in. It is off
+    by default: without an OS keyring (e.g. libsecret on headless Linux)
+    azure-identity fails on the first token request.
+    The credential is async, so tenants sign in concurrently without blocking
+    the event loop; close it with "async with" when the tenant is done.
+    """
+    from azure.identity import AzureAuthorityHosts, TokenCachePersistenceOptions
+    from azure.identity.aio import ClientSecretCredential
+    from throttling import get_rate_limiter
+
+    tenant_id = config["azure"]["tenant_id"]
+    client_id = config["azure"]["client_id"]
+    client_secret = config["azure"]["client_secret"]
+
+    if not all([tenant_id, client_id, client_secret]):
+        print("Error: Missing Azure credential configuration, please check config.json file")
+        sys.exit(1)
+
+    cache_config = config.get("token_cache", {})
+    cache_options = None
+    if cache_config.get("enabled", False):
+        cache_options = TokenCachePersistenceOptions(
+            name=cache_config.get("name", "app_registration_check"),
+            # Only fall back to a plain file when the OS keyring is unavailable and this is allowed
+            allow_unencrypted_storage=cache_config.get("allow_unencrypted_storage", False)
+        )
+
+    # Use ClientSecretCredential and specify Azure China cloud authority
+    try:
+        credential = ClientSecretCredential(
+            tenant_id=tenant_id,
+            client_id=client_id,
+            client_secret=client_secret,
+            authority=AzureAuthorityHosts.AZURE_CHINA,  # Specify China cloud authority
+            cache_persistence_options=cache_options
+        )
+        # Every Graph request made with this credential shares one rate limiter
+        get_rate_limiter(credential, config.get("throttling"))
+        return credential
+    except Exception as e:
+        print(f"Error creating Azure credentials: {str(e)}")
+        sys.exit(1)
+
+def create_graph_client(credentials, max_connections=MAX_CONNECTIONS, base_url=GRAPH_BASE_URL):
+    """
+    Create a GraphServiceClient for Azure China on a keep-alive connection pool;
+    max_connections also caps the concurrent requests of this client.
+    Requests go through the tenant's rate limiter, which also retries throttled GETs.
+    base_url points the client at another Graph endpoint, such as a local mock.
+    """
+    import httpx
+    from kiota_authentication_azure.azure_identity_authentication_provider import AzureIdentityAuthenticationProvider
+    from kiota_http.middleware.options import RetryHandlerOption
+    from msgraph import GraphServiceClient, GraphRequestAdapter
+    from msgraph_core import APIVersion, GraphClientFactory, NationalClouds
+    from throttling import ThrottledTransport, get_rate_limiter
+
+    auth_provider = AzureIdentityAuthenticationProvider(
+        credentials,
+        scopes=GRAPH_SCOPES,
+        allowed_hosts=[GRAPH_HOST]
+    )
+    transport = ThrottledTransport(
+        get_rate_limiter(credentials),
+        httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+    )
+    http_client = GraphClientFactory.create_with_default_middleware(
+        api_version=APIVersion.v1,
+        client=httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(60.0)),
+        host=NationalClouds.China,
+        # Throttling retries happen in the transport, where the limiter sees them
+        options={RetryHandlerOption.get_key(): RetryHandlerOption(should_retry=False)}
+    )
+    request_adapter = GraphRequestAdapter(auth_provider, client=http_client)
+    request_adapter.base_url = base_url
+    return GraphServiceClient(request_adapter=request_adapter)
+
+def create_tenant_graph_client(credentials, config):
+    """
+    Graph client for one tenant config, with its max_connections_per_tenant and graph_endpoint
+    """
+    return create_graph_client(
+        credentials,
+        config.get("max_connections_per_tenant", MAX_CONNECTIONS),
+        config.get("graph_endpoint", GRAPH_BASE_URL)
+    )
+
+def create_batch_client(config):
+    """
+    Pooled HTTP client for one tenant's Graph $batch lookups, sized for
+    lookups.max_concurrency. Keep it open for the whole scan so every batch
+    call reuses its TLS connections; the caller closes it.
+    """
+    import httpx
+
+    max_concurrency = config.get("lookups", {}).get("max_concurrency", 4)
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    return httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(60.0))
+
+def get_http_session():
+    """
+    Process-wide requests session with a keep-alive pool, used for Log Analytics
+    """
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        _http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONNECTIONS)
+        _http_session.mount("https://", adapter)
+        _http_session.mount("http://", adapter)
+    return _http_session
+
+async def graph_batch(client, credentials, requests, max_concurrency=4, base_url=GRAPH_BASE_URL):
+    """
+    Send GET sub-requests through Graph JSON $batch, 20 per call with up to
+    max_concurrency calls in flight, over client (see create_batch_client).
+    requests is a list of (id, relative url); returns {id: (status, body)}.
+    Each call costs one rate limiter token per sub-request; throttled calls and
+    throttled sub-requests are retried after their Retry-After.
+    """
+    from throttling import THROTTLE_STATUS, get_rate_limiter, retry_after
+
+    token = await credentials.get_token(*GRAPH_SCOPES)
+    headers = {"Authorization": f"Bearer {token.token}"}
+    limiter = get_rate_limiter(credentials)
+    slots = asyncio.Semaphore(max_concurrency)
+    results = {}
+
+    async def send(chunk):
+        attempt = 0
+        while chunk:
+            payload = {"requests": [{"id": request_id, "method": "GET", "url": url} for request_id, url in chunk]}
+            async with slots:
+                await limiter.acquire(len(chunk))
+                response = await client.post(f"{base_url}/$batch", json=payload, headers=headers)
+            retry = attempt < limiter.max_retries
+            if response.status_code in THROTTLE_STATUS and retry:
+                limiter.on_throttled(retry_after(response.headers, attempt))
+                attempt += 1
+                continue
+            response.raise_for_status()
+
+            throttled, delay = set(), 0.0
+            for item in response.json()["responses"]:
+                if item["status"] in THROTTLE_STATUS and retry:
+                    throttled.add(item["id"])
+                    delay = max(delay, retry_after(item.get("headers"), attempt))
+                else:
+                    results[item["id"]] = (item["status"], item.get("body"))
+            if throttled:
+                limiter.on_throttled(delay)
+            else:
+                limiter.on_success()
+            chunk = [(request_id, url) for request_id, url in chunk if request_id in throttled]
+            attempt += 1
+
+    await asyncio.gather(*(
+        send(requests[start:start + GRAPH_BATCH_SIZE])
+        for start in range(0, len(requests), GRAPH_BATCH_SIZE)
+    ))
+    return results
@@ -0,0 +1,153 @@
+"""
+End-to-end load benchmark of both app registration checkers against the local mock
+"""
+import argparse
+import asyncio
+import base64
+import contextlib
+import datetime
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from mock_graph import MockGraphServer, generate_tenant
+
+CHECK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VARIANTS = {
+    "loganalytics": os.path.join(CHECK_DIR, "LogAnalytics", "app_registration_check.py"),
+    "mailcheck": os.path.join(CHECK_DIR, "mailcheck", "app_registration_check.py")
+}
+
+class MockCredential:
+    """
+    Stands in for ClientSecretCredential; the mock accepts any bearer token
+    """
+
+    async def get_token(self, *scopes, **kwargs):
+        expires_on = int((datetime.datetime.now() + datetime.timedelta(hours=1)).timestamp())
+        return SimpleNamespace(token="mock-token", expires_on=expires_on)
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+def load_checker(variant):
+    spec = importlib.util.spec_from_file_location(f"{variant}_check", VARIANTS[variant])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    from throttling import get_rate_limiter
+
+    def get_mock_credentials(config):
+        credential = MockCredential()
+        get_rate_limiter(credential, config.get("throttling"))
+        return credential
+
+    # Everything but sign-in runs unchanged against the mock endpoints
+    module.get_azure_credentials = get_mock_credentials
+    return module
+
+def build_config(server, work_dir, args):
+    config = {
+        "azure": {"name": "mock", "tenant_id": "mock", "client_id": "mock", "client_secret": "mock"},
+        "graph_endpoint": server.graph_url,
+        "warning_days": 30,
+        "incremental": args.incremental,
+        "delta_state_file": os.path.join(work_dir, "delta_state.json"),
+        "output_dir": work_dir,
+        "lookups": {
+            "service_principals": args.service_principals,
+            "owners": args.owners,
+            "max_concurrency": args.lookup_concurrency
+        },
+        "log_analytics": {
+            "workspace_id": "mock",
+            "shared_key": base64.b64encode(b"mock-key").decode("ascii"),
+            "log_type": "AppRegistrationBenchmark",
+            "endpoint": server.logs_url
+        }
+    }
+    if args.requests_per_second:
+        config["throttling"] = {
+            "requests_per_second": args.requests_per_second,
+            "max_requests_per_second": max(args.requests_per_second, args.max_requests_per_second)
+        }
+    return config
+
+async def run_checker(module, variant, config):
+    if variant == "loganalytics":
+        await module.run_pipeline(config)
+    else:
+        await module.run_check(config)
+
+def run_once(module, variant, config, server, verbose):
+    server.state.reset_stats()
+    output = sys.stdout if verbose else io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        asyncio.run(run_checker(module, variant, config))
+    return time.perf_counter() - start, server.state.stats(), server.state.log_records
+
+def report(name, apps, credentials, seconds, stats, log_records):
+    print(f"{name}: {seconds:.2f}s, {apps / seconds:,.0f} apps/s, {credentials / seconds:,.0f} credentials/s")
+    for endpoint, endpoint_stats in stats.items():
+        print(f"  {endpoint:<20} {endpoint_stats['requests']:>6} requests  {endpoint_stats['throttled']:>5} throttled  "
+              f"p50 {endpoint_stats['p50_ms']:>8.2f} ms  p95 {endpoint_stats['p95_ms']:>8.2f} ms  "
+              f"p99 {endpoint_stats['p99_ms']:>8.2f} ms")
+    if log_records:
+        print(f"  Log Analytics received {log_records} records")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the app registration checkers end-to-end against a local mock tenant")
+    parser.add_argument("--variant", choices=["loganalytics", "mailcheck", "both"], default="both")
+    parser.add_argument("--apps", type=int, default=5000)
+    parser.add_argument("--secrets", type=int, default=2, help="Client secrets per application")
+    parser.add_argument("--certificates", type=int, default=0, help="Certificates per application")
+    parser.add_argument("--sp-secrets", type=int, default=0, help="Secrets per service principal")
+    parser.add_argument("--expiring-fraction", type=float, default=0.1)
+    parser.add_argument("--service-principals", action="store_true", help="Enable the service principal lookups")
+    parser.add_argument("--owners", action="store_true", help="Enable the owner lookups")
+    parser.add_argument("--lookup-concurrency", type=int, default=4)
+    parser.add_argument("--incremental", action="store_true",
+                        help="Benchmark the initial delta sync, then a sync after --change-fraction of apps changed")
+    parser.add_argument("--change-fraction", type=float, default=0.01)
+    parser.add_argument("--rate-limit", type=float, help="Mock throttles above this many requests per second")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latency the mock adds to each request")
+    parser.add_argument("--requests-per-second", type=float, help="Initial client rate limit (throttling setting)")
+    parser.add_argument("--max-requests-per-second", type=float, default=50.0)
+    parser.add_argument("--verbose", action="store_true", help="Show the checkers' own output")
+    args = parser.parse_args()
+
+    sys.path.insert(0, CHECK_DIR)
+    variants = ["loganalytics", "mailcheck"] if args.variant == "both" else [args.variant]
+    credentials = args.apps * (args.secrets + args.certificates + (args.sp_secrets if args.service_principals else 0))
+    print(f"Tenant: {args.apps} applications, {credentials} credentials")
+
+    for variant in variants:
+        module = load_checker(variant)
+        tenant = generate_tenant(args.apps, args.secrets, args.certificates, args.sp_secrets,
+                                 expiring_fraction=args.expiring_fraction)
+        server = MockGraphServer(tenant, args.rate_limit, args.latency_ms).start()
+        try:
+            with tempfile.TemporaryDirectory() as work_dir:
+                config = build_config(server, work_dir, args)
+                name = f"{variant} ({'delta initial' if args.incremental else 'full'})"
+                report(name, args.apps, credentials, *run_once(module, variant, config, server, args.verbose))
+                if args.incremental:
+                    server.state.change(args.change_fraction)
+                    report(f"{variant} (delta, {args.change_fraction:.0%} changed)", args.apps, credentials,
+                           *run_once(module, variant, config, server, args.verbose))
+        finally:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
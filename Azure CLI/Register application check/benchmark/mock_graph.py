@@ -0,0 +1,384 @@
+"""
+Local stand-in for the Graph and Log Analytics endpoints used by the app
+registration checkers, with generated tenant data, paging, $select, delta,
+$batch lookups, throttling and per-request statistics
+"""
+import argparse
+import datetime
+import gzip
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 999
+
+def _graph_time(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _credential(rng, now, expiring_fraction, certificate=False):
+    # Expiring credentials fall inside the default 30-day warning window
+    if rng.random() < expiring_fraction:
+        end = now + datetime.timedelta(days=rng.randint(-10, 30))
+    else:
+        end = now + datetime.timedelta(days=rng.randint(31, 730))
+    credential = {
+        "keyId": str(uuid.UUID(int=rng.getrandbits(128))),
+        "displayName": "cert" if certificate else "secret",
+        "startDateTime": _graph_time(end - datetime.timedelta(days=365)),
+        "endDateTime": _graph_time(end)
+    }
+    if certificate:
+        credential.update({"type": "AsymmetricX509Cert", "usage": "Verify"})
+    else:
+        credential["hint"] = "abc"
+    return credential
+
+def generate_tenant(apps, secrets, certificates=0, sp_secrets=0, owners=1, expiring_fraction=0.1, seed=0):
+    """
+    Tenant data for the mock: apps applications with secrets client secrets and
+    certificates certificates each, a service principal per application with
+    sp_secrets secrets, and owners owners per application
+    """
+    rng = random.Random(seed)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    tenant = {"applications": [], "service_principals": {}, "owners": {}}
+    for i in range(apps):
+        object_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        app_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        tenant["applications"].append({
+            "id": object_id,
+            "appId": app_id,
+            "displayName": f"app-{i:06d}",
+            "createdDateTime": _graph_time(now - datetime.timedelta(days=rng.randint(1, 1500))),
+            "signInAudience": "AzureADMyOrg",
+            "passwordCredentials": [_credential(rng, now, expiring_fraction) for _ in range(secrets)],
+            "keyCredentials": [_credential(rng, now, expiring_fraction, True) for _ in range(certificates)]
+        })
+        tenant["service_principals"][app_id] = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "displayName": f"app-{i:06d}",
+            "passwordCredentials": [_credential(rng, now, expiring_fraction) for _ in range(sp_secrets)],
+            "keyCredentials": []
+        }
+        tenant["owners"][object_id] = [
+            {"displayName": f"Owner {i}-{n}", "mail": f"owner{i}-{n}@contoso.cn",
+             "userPrincipalName": f"owner{i}-{n}@contoso.cn"}
+            for n in range(owners)
+        ]
+    return tenant
+
+def _percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, math.ceil(percent / 100 * len(values)) - 1)
+    return values[max(index, 0)]
+
+class MockState:
+    """
+    Tenant data, change versions for delta, the throttling bucket and request statistics
+    """
+
+    def __init__(self, tenant, rate_limit=None, latency_ms=0):
+        self.lock = threading.Lock()
+        self.applications = tenant["applications"]
+        self.service_principals = tenant["service_principals"]
+        self.owners = tenant["owners"]
+        # Every application has the version it was last changed in; delta tokens are versions
+        self.version = 1
+        self.versions = {app["id"]: 1 for app in self.applications}
+        self.oldest_delta = 0
+        self.rate_limit = rate_limit
+        self.tokens = rate_limit or 0
+        self.refilled = time.monotonic()
+        self.latency = latency_ms / 1000
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests = defaultdict(int)
+            self.throttled = defaultdict(int)
+            self.latencies = defaultdict(list)
+            self.log_records = 0
+            self.log_bytes = 0
+
+    def take(self, cost=1):
+        """
+        Consume cost tokens; returns 0, or the seconds to wait when throttled
+        """
+        if not self.rate_limit:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate_limit, self.tokens + (now - self.refilled) * self.rate_limit)
+            self.refilled = now
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return 0
+            return max(1, math.ceil((cost - self.tokens) / self.rate_limit))
+
+    def record(self, endpoint, seconds, throttled=False):
+        with self.lock:
+            self.requests[endpoint] += 1
+            self.latencies[endpoint].append(seconds)
+            if throttled:
+                self.throttled[endpoint] += 1
+
+    def change(self, fraction, seed=1):
+        """
+        Rotate the first credential of a fraction of the applications, as seen by delta
+        """
+        rng = random.Random(seed)
+        with self.lock:
+            self.version += 1
+            for app in rng.sample(self.applications, int(len(self.applications) * fraction)):
+                if app["passwordCredentials"]:
+                    app["passwordCredentials"][0]["keyId"] = str(uuid.UUID(int=rng.getrandbits(128)))
+                self.versions[app["id"]] = self.version
+
+    def expire_delta_tokens(self):
+        """
+        Make every issued delta token answer 410 Gone
+        """
+        with self.lock:
+            self.version += 1
+            self.oldest_delta = self.version
+
+    def stats(self):
+        """
+        Request counts, throttled responses and handling latency percentiles (ms) per endpoint
+        """
+        with self.lock:
+            return {
+                endpoint: {
+                    "requests": count,
+                    "throttled": self.throttled[endpoint],
+                    "p50_ms": round(_percentile(self.latencies[endpoint], 50) * 1000, 2),
+                    "p95_ms": round(_percentile(self.latencies[endpoint], 95) * 1000, 2),
+                    "p99_ms": round(_percentile(self.latencies[endpoint], 99) * 1000, 2)
+                }
+                for endpoint, count in sorted(self.requests.items())
+            }
+
+def _select(item, query):
+    fields = query.get("$select")
+    if not fields:
+        return item
+    # Graph always returns id
+    keep = set(fields[0].split(",")) | {"id"}
+    return {key: value for key, value in item.items() if key in keep}
+
+class GraphHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def _send(self, status, body=None, headers=None, throttled=False):
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        if self.endpoint:
+            # Recorded before the reply goes out, so a client never sees stale statistics
+            self.state.record(self.endpoint, time.perf_counter() - self.started, throttled or status == 429)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _throttled(self, wait):
+        error = {"error": {"code": "TooManyRequests", "message": "Too many requests"}}
+        self._send(429, error, {"Retry-After": wait})
+
+    def _base(self):
+        return f"http://{self.headers.get('Host')}/v1.0"
+
+    def _read_body(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return body
+
+    def _timed(self, endpoint, handler):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        handler()
+
+    def do_GET(self):
+        self.endpoint = None
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/v1.0/applications":
+            self._timed("applications", lambda: self._applications(query))
+        elif url.path == "/v1.0/applications/delta":
+            self._timed("applications/delta", lambda: self._delta(query))
+        elif url.path == "/stats":
+            self._send(200, self.state.stats())
+        else:
+            self._send(404, {"error": {"code": "Request_ResourceNotFound", "message": url.path}})
+
+    def do_POST(self):
+        self.endpoint = None
+        url = urlsplit(self.path)
+        if url.path == "/v1.0/$batch":
+            self._timed("$batch", self._batch)
+        elif url.path == "/api/logs":
+            self._timed("api/logs", self._logs)
+        else:
+            self._send(404, {"error": {"code": "Request_ResourceNotFound", "message": url.path}})
+
+    def _page(self, items, query, path, extra):
+        top = min(int(query.get("$top", [DEFAULT_PAGE_SIZE])[0]), MAX_PAGE_SIZE)
+        skip = int(query.get("$skiptoken", [0])[0])
+        body = {"value": [_select(item, query) for item in items[skip:skip + top]]}
+        if skip + top < len(items):
+            params = {"$skiptoken": skip + top, "$top": top, **extra}
+            if "$select" in query:
+                params["$select"] = query["$select"][0]
+            body["@odata.nextLink"] = f"{self._base()}{path}?{urlencode(params)}"
+        return body
+
+    def _applications(self, query):
+        wait = self.state.take()
+        if wait:
+            self._throttled(wait)
+            return
+        self._send(200, self._page(self.state.applications, query, "/applications", {}))
+
+    def _delta(self, query):
+        wait = self.state.take()
+        if wait:
+            self._throttled(wait)
+            return
+        state = self.state
+        if "$deltatoken" in query:
+            since = int(query["$deltatoken"][0])
+            if since < state.oldest_delta:
+                self._send(410, {"error": {"code": "SyncStateNotFound", "message": "Delta token expired"}})
+                return
+            with state.lock:
+                changed = [app for app in state.applications if state.versions[app["id"]] > since]
+            self._send(200, {"value": changed, "@odata.deltaLink": f"{self._base()}/applications/delta?$deltatoken={state.version}"})
+            return
+
+        # Initial sync: page through everything, the snapshot version is fixed by the first page
+        version = int(query.get("version", [state.version])[0])
+        body = self._page(state.applications, query, "/applications/delta", {"version": version})
+        if "@odata.nextLink" not in body:
+            body["@odata.deltaLink"] = f"{self._base()}/applications/delta?$deltatoken={version}"
+        self._send(200, body)
+
+    def _sub_request(self, url):
+        path = urlsplit(url)
+        query = parse_qs(path.query)
+        if path.path.startswith("/servicePrincipals(appId='"):
+            app_id = path.path[len("/servicePrincipals(appId='"):-2]
+            sp = self.state.service_principals.get(app_id)
+            if sp is None:
+                return 404, {"error": {"code": "Request_ResourceNotFound"}}
+            return 200, _select(sp, query)
+        if path.path.startswith("/applications/") and path.path.endswith("/owners"):
+            object_id = path.path.split("/")[2]
+            return 200, {"value": [_select(owner, query) for owner in self.state.owners.get(object_id, [])]}
+        return 404, {"error": {"code": "Request_ResourceNotFound"}}
+
+    def _batch(self):
+        payload = json.loads(self._read_body())
+        responses = []
+        throttled = False
+        for request in payload["requests"]:
+            # Graph evaluates throttling for each sub-request
+            wait = self.state.take()
+            if wait:
+                throttled = True
+                responses.append({"id": request["id"], "status": 429, "headers": {"Retry-After": str(wait)},
+                                  "body": {"error": {"code": "TooManyRequests"}}})
+                continue
+            status, body = self._sub_request(request["url"])
+            responses.append({"id": request["id"], "status": status, "body": body})
+        self._send(200, {"responses": responses}, throttled=throttled)
+
+    def _logs(self):
+        body = self._read_body()
+        if not self.headers.get("Authorization", "").startswith("SharedKey ") or not self.headers.get("Log-Type"):
+            self._send(403, {"Error": "InvalidAuthorization"})
+            return
+        records = json.loads(body)
+        with self.state.lock:
+            self.state.log_records += len(records)
+            self.state.log_bytes += len(body)
+        self._send(200)
+
+class MockGraphServer(ThreadingHTTPServer):
+    """
+    Mock server on a background thread; graph_url and logs_url are the
+    endpoints to put in the checker configuration
+    """
+    daemon_threads = True
+
+    def __init__(self, tenant, rate_limit=None, latency_ms=0, host="127.0.0.1", port=0):
+        super().__init__((host, port), GraphHandler)
+        self.state = MockState(tenant, rate_limit, latency_ms)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def graph_url(self):
+        return f"{self.base_url}/v1.0"
+
+    @property
+    def logs_url(self):
+        return self.base_url
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a generated tenant on a local mock Graph/Log Analytics endpoint")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--apps", type=int, default=1000)
+    parser.add_argument("--secrets", type=int, default=2, help="Client secrets per application")
+    parser.add_argument("--certificates", type=int, default=0, help="Certificates per application")
+    parser.add_argument("--sp-secrets", type=int, default=0, help="Secrets per service principal")
+    parser.add_argument("--rate-limit", type=float, help="Requests per second before answering 429")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added latency per request")
+    args = parser.parse_args()
+
+    tenant = generate_tenant(args.apps, args.secrets, args.certificates, args.sp_secrets)
+    server = MockGraphServer(tenant, args.rate_limit, args.latency_ms, port=args.port)
+    print(f"Graph endpoint: {server.graph_url}")
+    print(f"Log Analytics endpoint: {server.logs_url}")
+    print(f"Statistics: {server.base_url}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Command line, configuration loading and validation shared by the app registration checkers.
+Only the standard library is imported here, so --help, validation and
+offline commands start without loading the Azure SDKs.
+"""
+import argparse
+import json
+
+def _common_options(default_config=None):
+    # Defaults are suppressed here so a subcommand does not reset options given before it
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default=argparse.SUPPRESS,
+                        help=f"Configuration file (default: {default_config})" if default_config else "Configuration file")
+    common.add_argument("--dry-run", action="store_true", default=argparse.SUPPRESS,
+                        help="Validate and show what would be done, without sending anything")
+    return common
+
+def build_parser(description, default_config):
+    """
+    Parser with --config and --dry-run, accepted before or after the
+    subcommand; without a subcommand the checker runs "scan".
+    Returns (parser, subparsers)
+    """
+    parser = argparse.ArgumentParser(description=description, parents=[_common_options(default_config)])
+    subparsers = parser.add_subparsers(dest="command")
+    parser.set_defaults(config=default_config, dry_run=False, command="scan")
+    return parser, subparsers
+
+def add_command(subparsers, name, help):
+    return subparsers.add_parser(name, help=help, description=help, parents=[_common_options()])
+
+def load_config(config_path):
+    """
+    Load the JSON configuration; prints the problem and returns None if it cannot be read
+    """
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"Error: Configuration file not found at {config_path}")
+    except json.JSONDecodeError as e:
+        print(f"Error decoding configuration file {config_path}: {str(e)}")
+    except Exception as e:
+        print(f"Error loading configuration file: {str(e)}")
+    return None
+
+def validate_config(config, sections=("azure",)):
+    """
+    Problems found in config for the given sections ("azure", "log_analytics", "email"),
+    as a list of messages; empty when the configuration is usable
+    """
+    errors = []
+    if "azure" in sections:
+        tenants = config.get("tenants")
+        if tenants is not None and not isinstance(tenants, list):
+            errors.append("tenants must be a list")
+            tenants = []
+        entries = [(f"tenants[{index}]", tenant) for index, tenant in enumerate(tenants or [])]
+        if not tenants:
+            entries = [("azure", config.get("azure") or {})]
+        for name, entry in entries:
+            missing = [key for key in ("tenant_id", "client_id", "client_secret") if not entry.get(key)]
+            if missing:
+                errors.append(f"{name} is missing {', '.join(missing)}")
+
+    warning_days = config.get("warning_days", 30)
+    if not isinstance(warning_days, int) or warning_days < 0:
+        errors.append("warning_days must be a non-negative integer")
+
+    if "log_analytics" in sections:
+        la_config = config.get("log_analytics") or {}
+        missing = [key for key in ("workspace_id", "shared_key") if not la_config.get(key)]
+        if missing:
+            errors.append(f"log_analytics is missing {', '.join(missing)}")
+
+    if "email" in sections:
+        email_config = config.get("email") or {}
+        missing = [key for key in ("smtp_server", "sender", "recipients") if not email_config.get(key)]
+        if missing:
+            errors.append(f"email is missing {', '.join(missing)}")
+    return errors
+
+def check_config(config, sections=("azure",)):
+    """
+    Print the validation problems; True when there are none
+    """
+    errors = validate_config(config, sections)
+    for error in errors:
+        print(f"Configuration error: {error}")
+    return not errors
+
+def describe_scan(config):
+    """
+    Print what a scan with this configuration would do
+    """
+    tenants = config.get("tenants") or [config.get("azure") or {}]
+    names = [str(tenant.get("name") or tenant.get("tenant_id")) for tenant in tenants]
+    print(f"Tenants: {', '.join(names)} (at most {config.get('tenant_concurrency', 4)} at a time)")
+    print(f"Graph endpoint: {config.get('graph_endpoint', 'Azure China (default)')}")
+    print(f"Mode: {'incremental (applications/delta)' if config.get('incremental') else 'full enumeration'}")
+    lookups = [name for name in ("service_principals", "owners") if config.get("lookups", {}).get(name)]
+    print(f"Lookups: {', '.join(lookups) or 'none'}")
+    print(f"Warning window: {config.get('warning_days', 30)} days")
+    print(f"History database: {config.get('history_db') or 'disabled'}")
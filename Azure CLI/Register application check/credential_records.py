@@ -0,0 +1,158 @@
+"""
+Compact credential records shared by the app registration checkers
+"""
+import datetime
+
+DISPLAY_FORMAT = "%Y-%m-%d %H:%M:%S"
+UTC_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+def run_clock():
+    """
+    Single reference timestamp for a run; every days_to_expire is relative to it
+    """
+    return datetime.datetime.now(datetime.timezone.utc)
+
+def _as_utc(dt):
+    # Graph returns UTC; naive values are treated as UTC like before
+    return dt.replace(tzinfo=datetime.timezone.utc) if dt.tzinfo is None else dt
+
+class CredentialRecord:
+    """
+    One credential of an application or its service principal, or a
+    placeholder for an application without credentials (credential_type
+    is None). Datetimes stay raw, display formatting happens in to_dict().
+    """
+    __slots__ = (
+        "display_name", "app_id", "created", "credential_type", "key_id",
+        "end_date", "days_to_expire", "source", "owners", "tenant"
+    )
+
+    def __init__(self, display_name, app_id, created, credential_type, key_id, end_date, days_to_expire,
+                 source="Application", owners=None):
+        self.display_name = display_name
+        self.app_id = app_id
+        self.created = created
+        self.credential_type = credential_type
+        self.key_id = key_id
+        self.end_date = end_date
+        self.days_to_expire = days_to_expire
+        self.source = source
+        self.owners = owners
+        self.tenant = None
+
+    def is_expiring(self, warning_days):
+        """
+        Expires within warning_days, or has already expired
+        """
+        return self.days_to_expire is not None and self.days_to_expire <= warning_days
+
+    def sort_key(self):
+        # Soonest expiry first, records without an end date last
+        return self.days_to_expire if self.days_to_expire is not None else float('inf')
+
+    def to_dict(self):
+        """
+        Output representation used by the JSON file, Log Analytics and reports
+        """
+        if self.credential_type is None:
+            end_date, days = "None", "N/A"
+        elif self.end_date is None:
+            end_date, days = "Unknown", "Unknown"
+        else:
+            end_date = self.end_date.astimezone().strftime(DISPLAY_FORMAT)
+            days = self.days_to_expire
+        return {
+            "display_name": self.display_name,
+            "app_id": self.app_id,
+            "created_time": self.created.astimezone().strftime(DISPLAY_FORMAT) if self.created else "Unknown",
+            "password": self.credential_type or "None",
+            "end_date": end_date,
+            "days_to_expire": days,
+            "key_id": self.key_id,
+            "end_date_utc": self.end_date.strftime(UTC_FORMAT) if self.end_date else None,
+            "source": self.source,
+            "owners": ", ".join(self.owners) if self.owners else "",
+            "tenant": self.tenant
+        }
+
+    @classmethod
+    def from_dict(cls, data, now):
+        """
+        Rebuild a record from its to_dict() output, e.g. a saved snapshot;
+        days_to_expire is recomputed against now
+        """
+        end_date = None
+        if data.get("end_date_utc"):
+            end_date = datetime.datetime.strptime(data["end_date_utc"], UTC_FORMAT).replace(tzinfo=datetime.timezone.utc)
+        created = None
+        if data.get("created_time") not in (None, "Unknown"):
+            created = datetime.datetime.strptime(data["created_time"], DISPLAY_FORMAT).astimezone()
+        record = cls(
+            data.get("display_name"),
+            data.get("app_id"),
+            created,
+            # Placeholders for applications without credentials have the end date "None"
+            None if data.get("end_date") == "None" else data.get("password"),
+            data.get("key_id"),
+            end_date,
+            (end_date - now).days if end_date else None,
+            data.get("source", "Application"),
+            data["owners"].split(", ") if data.get("owners") else None
+        )
+        record.tenant = data.get("tenant")
+        return record
+
+def _credential_record(display_name, app_id, created, credential_type, key_id, end_date, now, source):
+    return CredentialRecord(
+        display_name,
+        app_id,
+        created,
+        credential_type if key_id else "None",
+        str(key_id) if key_id else None,
+        end_date,
+        (end_date - now).days if end_date else None,
+        source
+    )
+
+def records_from_app(app, now):
+    """
+    Build one record per client secret and certificate of an application
+    (one placeholder record if it has none)
+    """
+    display_name = app.display_name if app.display_name is not None else 'N/A'
+    app_id = app.app_id if app.app_id is not None else 'N/A'
+    created = _as_utc(app.created_date_time) if app.created_date_time else None
+
+    credentials = [("Password", pwd) for pwd in app.password_credentials or []]
+    credentials += [("Certificate", cert) for cert in app.key_credentials or []]
+    if not credentials:
+        return [CredentialRecord(display_name, app_id, created, None, None, None, None)]
+
+    return [
+        _credential_record(
+            display_name, app_id, created, credential_type, cred.key_id,
+            _as_utc(cred.end_date_time) if cred.end_date_time else None,
+            now, "Application"
+        )
+        for credential_type, cred in credentials
+    ]
+
+def records_from_service_principal(sp, app_id, now):
+    """
+    Build records for the secrets and certificates of an enterprise application
+    (service principal) from its Graph JSON representation
+    """
+    # Imported here so offline commands do not pay for it
+    from dateutil.parser import parse
+
+    display_name = sp.get("displayName") or 'N/A'
+    credentials = [("Password", pwd) for pwd in sp.get("passwordCredentials") or []]
+    credentials += [("Certificate", cert) for cert in sp.get("keyCredentials") or []]
+    return [
+        _credential_record(
+            display_name, app_id, None, credential_type, cred.get("keyId"),
+            _as_utc(parse(cred["endDateTime"])) if cred.get("endDateTime") else None,
+            now, "ServicePrincipal"
+        )
+        for credential_type, cred in credentials
+    ]
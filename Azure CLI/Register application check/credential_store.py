@@ -0,0 +1,180 @@
+"""
+SQLite history of application credentials shared by the app registration checkers
+"""
+import datetime
+import os
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_at TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS credentials (
+    app_id TEXT NOT NULL,
+    key_id TEXT NOT NULL,
+    display_name TEXT,
+    end_date TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (app_id, key_id)
+);
+-- The primary key already indexes app_id as its leading column
+CREATE INDEX IF NOT EXISTS idx_credentials_end_date ON credentials (end_date);
+CREATE INDEX IF NOT EXISTS idx_credentials_last_seen ON credentials (last_seen);
+"""
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+def to_timestamp(dt):
+    """
+    Fixed-width UTC text, so string order in SQLite is chronological order
+    """
+    return dt.astimezone(datetime.timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+def from_timestamp(text):
+    return datetime.datetime.strptime(text, TIMESTAMP_FORMAT).replace(tzinfo=datetime.timezone.utc)
+
+class CredentialStore:
+    """
+    One row per (app_id, key_id), with when it was first and last seen
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.run_at = None
+        self.previous_run_at = None
+
+    def begin_run(self, run_time=None):
+        """
+        Register a new run; credentials added afterwards are stamped with it
+        """
+        run_time = run_time or datetime.datetime.now(datetime.timezone.utc)
+        self.run_at = to_timestamp(run_time)
+        self.previous_run_at = self.conn.execute(
+            "SELECT MAX(run_at) FROM runs WHERE run_at < ?", (self.run_at,)
+        ).fetchone()[0]
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO runs (run_at) VALUES (?)", (self.run_at,))
+        return self.run_at
+
+    def add_credentials(self, records):
+        """
+        Upsert the CredentialRecords seen in the current run;
+        placeholders without a key_id are skipped
+        """
+        rows = [
+            (r.app_id, r.key_id, r.display_name, to_timestamp(r.end_date) if r.end_date else None, self.run_at, self.run_at)
+            for r in records if r.key_id
+        ]
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO credentials (app_id, key_id, display_name, end_date, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (app_id, key_id) DO UPDATE SET
+                    display_name = excluded.display_name,
+                    end_date = excluded.end_date,
+                    last_seen = excluded.last_seen
+                """,
+                rows
+            )
+        return len(rows)
+
+    def _latest_run(self):
+        if self.run_at is None:
+            self.run_at = self.conn.execute("SELECT MAX(run_at) FROM runs").fetchone()[0]
+        return self.run_at
+
+    def expiring_within(self, days, now=None):
+        """
+        Credentials still present in the latest run that expire within days
+        (already expired ones included), soonest first
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        limit = to_timestamp(now + datetime.timedelta(days=days))
+        return self.conn.execute(
+            """
+            SELECT * FROM credentials
+            WHERE end_date <= ? AND last_seen = ?
+            ORDER BY end_date
+            """,
+            (limit, self._latest_run())
+        ).fetchall()
+
+    def newly_expiring(self, days):
+        """
+        Credentials that entered the expiry window since the previous run:
+        either new since then, or outside the window as of that run
+        """
+        latest = self._latest_run()
+        if self.previous_run_at is None:
+            row = self.conn.execute("SELECT MAX(run_at) FROM runs WHERE run_at < ?", (latest,)).fetchone()
+            self.previous_run_at = row[0]
+        if self.previous_run_at is None:
+            return self.expiring_within(days)
+
+        window = datetime.timedelta(days=days)
+        return self.conn.execute(
+            """
+            SELECT * FROM credentials
+            WHERE end_date <= ? AND last_seen = ?
+              AND (end_date > ? OR first_seen > ?)
+            ORDER BY end_date
+            """,
+            (
+                to_timestamp(from_timestamp(latest) + window),
+                latest,
+                to_timestamp(from_timestamp(self.previous_run_at) + window),
+                self.previous_run_at
+            )
+        ).fetchall()
+
+    def expiry_trend(self, months=12, now=None):
+        """
+        Number of current credentials expiring per month, from this month on
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        start = to_timestamp(now.replace(day=1, hour=0, minute=0, second=0, microsecond=0))
+        rows = self.conn.execute(
+            """
+            SELECT substr(end_date, 1, 7) AS month, COUNT(*) AS credentials
+            FROM credentials
+            WHERE end_date >= ? AND last_seen = ?
+            GROUP BY month
+            ORDER BY month
+            LIMIT ?
+            """,
+            (start, self._latest_run(), months)
+        ).fetchall()
+        return [(row["month"], row["credentials"]) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+def print_history_summary(store, days):
+    """
+    Print credentials that newly entered the expiry window and the monthly expiry trend
+    """
+    newly = store.newly_expiring(days)
+    print(f"{len(newly)} credentials entered the {days}-day expiry window since the last run")
+    for row in newly:
+        print(f"  {row['display_name']} ({row['app_id']}) expires {row['end_date']}")
+    trend = store.expiry_trend()
+    if trend:
+        print("Credentials expiring per month: " + ", ".join(f"{month}: {count}" for month, count in trend))
+
+def open_history_store(config, base_dir):
+    """
+    Open the SQLite credential history configured by "history_db", if any;
+    a relative path is taken from base_dir (the checker's directory)
+    """
+    db_path = config.get("history_db")
+    if not db_path:
+        return None
+    if not os.path.isabs(db_path):
+        db_path = os.path.join(base_dir, db_path)
+    return CredentialStore(db_path)
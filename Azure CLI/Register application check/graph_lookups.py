@@ -0,0 +1,93 @@
+"""
+Service principal and owner lookups for applications, sent through Graph $batch
+"""
+from azure_clients import GRAPH_BASE_URL, graph_batch
+from credential_records import records_from_app, records_from_service_principal
+
+# Applications looked up together; each adds up to two sub-requests
+LOOKUP_GROUP_SIZE = 200
+
+SERVICE_PRINCIPAL_SELECT = "id,displayName,passwordCredentials,keyCredentials"
+OWNER_SELECT = "displayName,mail,userPrincipalName"
+
+def lookup_requests(apps, service_principals, owners):
+    """
+    Sub-requests for a group of applications, identified by their position in the group
+    """
+    requests = []
+    for index, app in enumerate(apps):
+        if service_principals and app.app_id:
+            requests.append((f"sp{index}", f"/servicePrincipals(appId='{app.app_id}')?$select={SERVICE_PRINCIPAL_SELECT}"))
+        if owners and app.id:
+            requests.append((f"owners{index}", f"/applications/{app.id}/owners?$select={OWNER_SELECT}"))
+    return requests
+
+async def enrich_records(credentials, batch_client, apps, now, service_principals, owners, max_concurrency=4,
+                         base_url=GRAPH_BASE_URL):
+    """
+    Records for a group of applications, including service principal credentials and owners
+    """
+    requests = lookup_requests(apps, service_principals, owners)
+    results = await graph_batch(batch_client, credentials, requests, max_concurrency, base_url)
+    records = []
+    failed = 0
+    for index, app in enumerate(apps):
+        app_records = records_from_app(app, now)
+
+        status, body = results.get(f"sp{index}", (None, None))
+        if status == 200:
+            sp_records = records_from_service_principal(body, app_records[0].app_id, now)
+            # The placeholder is only needed when nothing at all has credentials
+            if sp_records and app_records[0].credential_type is None:
+                app_records = []
+            app_records += sp_records
+        elif status not in (None, 404):  # 404: no enterprise application for this app
+            failed += 1
+
+        status, body = results.get(f"owners{index}", (None, None))
+        if status == 200:
+            names = [o.get("mail") or o.get("userPrincipalName") or o.get("displayName") for o in body.get("value", [])]
+            for record in app_records:
+                record.owners = names
+        elif status is not None:
+            failed += 1
+
+        records.extend(app_records)
+    if failed:
+        print(f"Warning: {failed} service principal/owner lookups failed")
+    return records
+
+async def iter_app_records(credentials, batch_client, applications, now, config):
+    """
+    Yield CredentialRecords for every application, tagged with config["tenant"],
+    adding the service principal and owner lookups enabled in config["lookups"],
+    sent over the tenant's batch_client
+    """
+    async for record in _iter_app_records(credentials, batch_client, applications, now, config):
+        record.tenant = config.get("tenant")
+        yield record
+
+async def _iter_app_records(credentials, batch_client, applications, now, config):
+    lookups = config.get("lookups", {})
+    service_principals = lookups.get("service_principals", False)
+    owners = lookups.get("owners", False)
+    if not (service_principals or owners):
+        async for app in applications:
+            for record in records_from_app(app, now):
+                yield record
+        return
+
+    max_concurrency = lookups.get("max_concurrency", 4)
+    base_url = config.get("graph_endpoint", GRAPH_BASE_URL)
+    group = []
+    async for app in applications:
+        group.append(app)
+        if len(group) >= LOOKUP_GROUP_SIZE:
+            for record in await enrich_records(credentials, batch_client, group, now, service_principals, owners,
+                                               max_concurrency, base_url):
+                yield record
+            group = []
+    if group:
+        for record in await enrich_records(credentials, batch_client, group, now, service_principals, owners,
+                                           max_concurrency, base_url):
+            yield record
@@ -4,222 +4,246 @@ import json
 import datetime
 import smtplib
 import asyncio
+import csv
+import gzip
+import io
+from collections import defaultdict
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.mime.application import MIMEApplication
 from email.header import Header
-from azure.identity import ClientSecretCredential, AzureAuthorityHosts
-from msgraph import GraphServiceClient
-from dateutil.parser import parse
-from tabulate import tabulate
 
-def get_azure_credentials(config):
+# Shared client module lives one level up, next to both checker variants.
+# These modules import the Azure SDKs only when going online, so --help,
+# validation and offline commands start quickly.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from applications import iter_application_source
+from azure_clients import get_azure_credentials, create_batch_client, create_tenant_graph_client
+from checker_cli import add_command, build_parser, check_config, describe_scan, load_config
+from credential_store import open_history_store, print_history_summary
+from credential_records import CredentialRecord, run_clock
+from graph_lookups import iter_app_records
+from smtp_delivery import SmtpSession, deliver
+from tenants import scan_tenants
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(SCRIPT_DIR, 'config.json')
+
+async def get_app_registrations(credentials, config):
     """
-    Get Azure credentials from configuration file
+    Get all application registration information.
+    Errors propagate so a failed scan is never mistaken for an empty tenant.
     """
-    tenant_id = config["azure"]["tenant_id"]
-    client_id = config["azure"]["client_id"]
-    client_secret = config["azure"]["client_secret"]
+    # Initialize GraphServiceClient for Azure China on a pooled transport
+    graph_client = create_tenant_graph_client(credentials, config)
     
-    if not all([tenant_id, client_id, client_secret]):
-        print("Error: Missing Azure credential configuration, please check config.json file")
-        sys.exit(1)
-        
-    # Use ClientSecretCredential and specify Azure China cloud authority
-    try:
-        credential = ClientSecretCredential(
-            tenant_id=tenant_id,
-            client_id=client_id,
-            client_secret=client_secret,
-            authority=AzureAuthorityHosts.AZURE_CHINA  # Specify China cloud authority
-        )
-        return credential
-    except Exception as e:
-        print(f"Error creating Azure credentials: {str(e)}")
-        sys.exit(1)
+    now = run_clock()
+    app_info = []
+    applications = iter_application_source(graph_client, config, SCRIPT_DIR)
+    async with create_batch_client(config) as batch_client:
+        async for record in iter_app_records(credentials, batch_client, applications, now, config):
+            app_info.append(record)
+    
+    return app_info
 
-async def get_app_registrations(credentials, config):
+async def scan_tenant(config):
     """
-    Get all application registration information
+    Sign in to one tenant and get its application registrations
     """
-    try:
-        # Define Graph API scopes
-        scopes = ['https://microsoftgraph.chinacloudapi.cn/.default']  # Use China cloud Graph scope
-        
-        # Initialize GraphServiceClient for Azure China
-        graph_client = GraphServiceClient(
-            credentials=credentials,
-            scopes=scopes
-        )
-        
-        graph_client.request_adapter.base_url = "https://microsoftgraph.chinacloudapi.cn/v1.0"
+    async with get_azure_credentials(config) as credentials:
+        return await get_app_registrations(credentials, config)
 
-        # Get applications - use await keyword to wait for async operation
-        result = await graph_client.applications.get()
-        
-        app_info = []
-        if hasattr(result, 'value'):
-            for app in result.value:
-                passwords = app.password_credentials if hasattr(app, 'password_credentials') else []
-                
-                created_time_str = "Unknown"
-                if hasattr(app, 'created_date_time') and app.created_date_time:
-                    # Ensure created_date_time is timezone aware
-                    created_dt = app.created_date_time
-                    if hasattr(created_dt, 'replace'):
-                        created_dt_aware = created_dt.replace(tzinfo=datetime.timezone.utc).astimezone(tz=None)
-                        created_time_str = created_dt_aware.strftime("%Y-%m-%d %H:%M:%S")
-                
-                if not passwords:
-                    app_info.append({
-                        "display_name": app.display_name if hasattr(app, 'display_name') else 'N/A',
-                        "app_id": app.app_id if hasattr(app, 'app_id') else 'N/A',
-                        "created_time": created_time_str,
-                        "password": "None",
-                        "end_date": "None",
-                        "days_to_expire": "N/A"
-                    })
-                else:
-                    for pwd in passwords:
-                        end_date_str = "Unknown"
-                        days_to_expire = "Unknown"
-                        
-                        if hasattr(pwd, 'end_date_time') and pwd.end_date_time:
-                            end_dt = pwd.end_date_time
-                            if hasattr(end_dt, 'replace'):
-                                end_dt_aware = end_dt.replace(tzinfo=datetime.timezone.utc)
-                                now_aware = datetime.datetime.now(datetime.timezone.utc)
-                                days_to_expire = (end_dt_aware - now_aware).days
-                                end_date_str = end_dt_aware.astimezone(tz=None).strftime("%Y-%m-%d %H:%M:%S")
-                        
-                        app_info.append({
-                            "display_name": app.display_name if hasattr(app, 'display_name') else 'N/A',
-                            "app_id": app.app_id if hasattr(app, 'app_id') else 'N/A',
-                            "created_time": created_time_str,
-                            "password": "Password" if hasattr(pwd, 'key_id') and pwd.key_id else "None",
-                            "end_date": end_date_str,
-                            "days_to_expire": days_to_expire
-                        })
-        
-        return app_info
-    except Exception as e:
-        print(f"Error getting application registration information: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return []
+REPORT_HEADERS = ["Display Name", "Application ID", "Creation Time", "Credential", "Expiration Date", "Days to Expire", "Owners"]
+INVENTORY_FIELDS = [
+    "tenant", "display_name", "app_id", "created_time", "password", "source",
+    "key_id", "end_date", "end_date_utc", "days_to_expire", "owners"
+]
 
-def generate_report(app_info):
-    """
-    Generate report content
-    """
-    app_info.sort(key=lambda x: x["days_to_expire"] if isinstance(x["days_to_expire"], int) else float('inf'))
-    
-    headers = ["Display Name", "Application ID", "Creation Time", "Client Secret", "Expiration Date", "Days to Expire"]
-    table_data = []
-    html_rows = ""
-    
-    for app in app_info:
-        days = app["days_to_expire"]
-        days_str = f"{days} days" if isinstance(days, int) else days
-        
-        row_class = ""
-        if isinstance(days, int):
-            if days < 0:
-                row_class = "expired"
-            elif days <= 30:  # Highlight passwords expiring within 30 days
-                row_class = "warning"
-        
-        # Text report data
-        text_row = [
-            app["display_name"],
-            app["app_id"],
-            app["created_time"],
-            app["password"],
-            app["end_date"],
-            days_str
-        ]
-        table_data.append(text_row)
-        
-        # HTML report data (with class)
-        html_rows += f"<tr class='{row_class}'><td>{app['display_name']}</td><td>{app['app_id']}</td><td>{app['created_time']}</td><td>{app['password']}</td><td>{app['end_date']}</td><td>{days_str}</td></tr>\n"
-    
-    # Manually generate HTML table to support class attributes
-    html_table = f"""
+REPORT_TEMPLATE = """<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        table { border-collapse: collapse; width: 100%; font-family: sans-serif; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+        tr:nth-child(even) { background-color: #f9f9f9; }
+        tr.warning { background-color: #fffacd; } /* Light yellow for warning */
+        tr.expired { background-color: #ffcccc; } /* Light red for expired */
+        body { font-family: sans-serif; }
+    </style>
+</head>
+<body>
+    <h2>Azure Application Registration Check Report</h2>
+    <p>Generated at: {{ generated_at }}</p>
+    {% if intro %}<p>{{ intro }}</p>{% endif %}
+    {% if digest %}
+    <p>{{ summary.credentials }} credentials checked: {{ summary.expired }} expired,
+       {{ summary.expiring }} expiring within {{ warning_days }} days,
+       {{ summary.without_credentials }} applications without credentials.
+       {% if attachment %}The full inventory is attached as {{ attachment }}.{% endif %}</p>
+    {% endif %}
     <table>
         <thead>
-            <tr><th>{'</th><th>'.join(headers)}</th></tr>
+            <tr>{% for header in headers %}<th>{{ header }}</th>{% endfor %}</tr>
         </thead>
         <tbody>
-            {html_rows}
-        </tbody>
+{% for row in rows %}            <tr class='{{ row.row_class }}'>{% if multi_tenant %}<td>{{ row.tenant }}</td>{% endif %}<td>{{ row.display_name }}</td><td>{{ row.app_id }}</td><td>{{ row.created_time }}</td><td>{{ row.password }}</td><td>{{ row.end_date }}</td><td>{{ row.days_str }}</td><td>{{ row.owners }}</td></tr>
+{% endfor %}        </tbody>
     </table>
+    <p>Note: Yellow background indicates expiring soon (<= {{ warning_days }} days), red background indicates expired client secrets.</p>
+</body>
+</html>
+"""
+
+_report_template = None
+
+def report_template():
     """
-    
-    html_report = f"""
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <style>
-            table {{ border-collapse: collapse; width: 100%; font-family: sans-serif; }}
-            th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-            th {{ background-color: #f2f2f2; }}
-            tr:nth-child(even) {{ background-color: #f9f9f9; }}
-            tr.warning {{ background-color: #fffacd; }} /* Light yellow for warning */
-            tr.expired {{ background-color: #ffcccc; }} /* Light red for expired */
-            body {{ font-family: sans-serif; }}
-        </style>
-    </head>
-    <body>
-        <h2>Azure Application Registration Check Report</h2>
-        <p>Generated at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        {html_table}
-        <p>Note: Yellow background indicates expiring soon (<= 30 days), red background indicates expired client secrets.</p>
-    </body>
-    </html>
+    The HTML report template, compiled once per process
+    """
+    global _report_template
+    if _report_template is None:
+        from jinja2 import Environment
+
+        _report_template = Environment(autoescape=True).from_string(REPORT_TEMPLATE)
+    return _report_template
+
+def _report_rows(app_info, warning_days):
+    # Display formatting happens here, once per output row
+    for record in app_info:
+        app = record.to_dict()
+        days = app["days_to_expire"]
+        app["days_str"] = f"{days} days" if isinstance(days, int) else days
+        app["row_class"] = ""
+        if isinstance(days, int):
+            if days < 0:
+                app["row_class"] = "expired"
+            elif days <= warning_days:  # Highlight passwords expiring within warning_days
+                app["row_class"] = "warning"
+        yield app
+
+def report_summary(app_info, warning_days=30):
+    """
+    Credential counts shown at the top of a digest report
+    """
+    expired = sum(1 for record in app_info if record.days_to_expire is not None and record.days_to_expire < 0)
+    return {
+        "credentials": sum(1 for record in app_info if record.credential_type is not None),
+        "expired": expired,
+        "expiring": sum(1 for record in app_info if record.is_expiring(warning_days)) - expired,
+        "without_credentials": sum(1 for record in app_info if record.credential_type is None)
+    }
+
+def generate_report(app_info, warning_days=30, digest=False, attachment=None, intro=None):
+    """
+    Generate report content. A digest only lists expired and expiring
+    credentials, below summary counts; attachment names the file holding
+    the full inventory; intro is an opening paragraph.
     """
+    from tabulate import tabulate
+
+    app_info.sort(key=CredentialRecord.sort_key)
+    rows = [record for record in app_info if record.is_expiring(warning_days)] if digest else app_info
+    
+    headers = list(REPORT_HEADERS)
+    # Only name the tenant when the report covers more than one
+    multi_tenant = len({record.tenant for record in app_info}) > 1
+    if multi_tenant:
+        headers.insert(0, "Tenant")
+    summary = report_summary(app_info, warning_days) if digest else None
+    generated_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Formatted once, shared by the HTML and text reports
+    rows = list(_report_rows(rows, warning_days))
+    
+    # The template streams its output straight into the buffer
+    buffer = io.StringIO()
+    buffer.writelines(report_template().generate(
+        headers=headers,
+        rows=rows,
+        multi_tenant=multi_tenant,
+        digest=digest,
+        summary=summary,
+        attachment=attachment,
+        intro=intro,
+        warning_days=warning_days,
+        generated_at=generated_at
+    ))
+    html_report = buffer.getvalue()
     
     # Use tabulate to generate text report
-    text_report = tabulate(table_data, headers=headers, tablefmt="grid")
-    text_report = f"Azure Application Registration Check Report\nGenerated at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n{text_report}"
+    columns = [key for key in ("tenant",) if multi_tenant] + [
+        "display_name", "app_id", "created_time", "password", "end_date", "days_str", "owners"
+    ]
+    table_data = [[row[key] for key in columns] for row in rows]
+    # Every cell is already text; skipping number detection keeps large tables fast
+    text_report = tabulate(table_data, headers=headers, tablefmt="grid", disable_numparse=True)
+    if digest:
+        text_report = (f"{summary['credentials']} credentials checked: {summary['expired']} expired, "
+                       f"{summary['expiring']} expiring within {warning_days} days, "
+                       f"{summary['without_credentials']} applications without credentials\n\n{text_report}")
+    if intro:
+        text_report = f"{intro}\n\n{text_report}"
+    text_report = f"Azure Application Registration Check Report\nGenerated at: {generated_at}\n\n{text_report}"
     
     return html_report, text_report
 
-def send_email(html_content, text_content, config):
+def build_inventory_csv(app_info):
+    """
+    Every record as a gzip-compressed CSV (UTF-8 with BOM, so Excel shows names correctly)
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb') as compressed:
+        with io.TextIOWrapper(compressed, encoding='utf-8-sig', newline='') as text:
+            writer = csv.DictWriter(text, fieldnames=INVENTORY_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(record.to_dict() for record in app_info)
+    return buffer.getvalue()
+
+def build_message(html_content, text_content, sender, recipients, subject, attachments=None):
     """
-    Send email
+    Multipart message with text and HTML alternatives; attachments is a list of (filename, bytes)
     """
+    body = MIMEMultipart('alternative')
+    part1 = MIMEText(text_content, 'plain', 'utf-8')
+    part2 = MIMEText(html_content, 'html', 'utf-8')
+    body.attach(part1)
+    body.attach(part2)
+    
+    if attachments:
+        message = MIMEMultipart('mixed')
+        message.attach(body)
+        for filename, content in attachments:
+            attachment = MIMEApplication(content, Name=filename)
+            attachment['Content-Disposition'] = f'attachment; filename="{filename}"'
+            message.attach(attachment)
+    else:
+        message = body
+    message['From'] = sender
+    message['To'] = ", ".join(recipients)
+    message['Subject'] = Header(subject, 'utf-8')
+    return message
+
+def send_email(html_content, text_content, config, attachments=None):
+    """
+    Send email; attachments is a list of (filename, bytes)
+    """
+    session = None
     try:
-        message = MIMEMultipart('alternative')
-        message['From'] = config["email"]["sender"]
         # Ensure recipients is a list of strings
         recipients = config["email"]["recipients"]
         if isinstance(recipients, str):
             recipients = [recipients]
-        message['To'] = ", ".join(recipients)
-        message['Subject'] = Header(config["email"]["subject"], 'utf-8')
-        
-        part1 = MIMEText(text_content, 'plain', 'utf-8')
-        part2 = MIMEText(html_content, 'html', 'utf-8')
-        message.attach(part1)
-        message.attach(part2)
-        
-        smtp_server = config["email"]["smtp_server"]
-        smtp_port = config["email"]["smtp_port"]
-        sender = config["email"]["sender"]
-        password = config["email"]["password"]
+        message = build_message(
+            html_content, text_content, config["email"]["sender"], recipients, config["email"]["subject"], attachments
+        )
         
-        if not password:
+        if not config["email"]["password"]:
             print("Warning: Email password not set, please configure in config.json file")
             return False
         
-        # Use SMTP_SSL for implicit TLS/SSL connection, or starttls for explicit connection
-        # Check your provider's requirements. Example using starttls:
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.ehlo()  # Say hello to the server
-        server.starttls()  # Start TLS encryption
-        server.ehlo()  # Say hello again after TLS
-        server.login(sender, password)
-        server.sendmail(sender, recipients, message.as_string())
-        server.quit()
+        session = SmtpSession(config["email"])
+        session.send(message, recipients)
         
         print(f"Email successfully sent to {', '.join(recipients)}")
         return True
@@ -229,56 +253,175 @@ def send_email(html_content, text_content, config):
     except Exception as e:
         print(f"Error sending email: {str(e)}")
         return False
+    finally:
+        if session:
+            session.close()
 
-async def async_main():
+def owner_messages(app_info, config):
     """
-    Async main function
+    One message per owner (from the owners lookup) listing the expired and
+    expiring credentials of the applications they own
     """
-    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
-    
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: Configuration file not found at {config_path}")
-        return
-    except json.JSONDecodeError as e:
-        print(f"Error decoding configuration file {config_path}: {str(e)}")
-        return
-    except Exception as e:
-        print(f"Error loading configuration file: {str(e)}")
-        return
+    warning_days = config.get("warning_days", 30)
+    by_owner = defaultdict(list)
+    for record in app_info:
+        if record.is_expiring(warning_days):
+            # Owners without a mail address or UPN cannot be notified
+            for owner in record.owners or []:
+                if "@" in owner:
+                    by_owner[owner].append(record)
     
-    credentials = get_azure_credentials(config)
-    if not credentials:
-        return  # Exit if credentials fail
-    
-    print("Getting Azure application registration information...")
-    app_info = await get_app_registrations(credentials, config)  # Use await to wait for async function
-    
-    if not app_info:
-        print("No application registration information found or error occurred during retrieval")
-        return
+    messages = []
+    for owner, records in sorted(by_owner.items()):
+        html_report, text_report = generate_report(
+            records,
+            warning_days,
+            intro=f"You are an owner of applications with {len(records)} credentials that expired "
+                  f"or expire within {warning_days} days. Please renew or remove them."
+        )
+        subject = f"{config['email']['subject']} - {len(records)} credentials to renew"
+        messages.append(([owner], build_message(html_report, text_report, config["email"]["sender"], [owner], subject)))
+    return messages
+
+def notify_owners(app_info, config, dry_run=False):
+    """
+    Send every owner their own report over a few reused SMTP connections
+    """
+    messages = owner_messages(app_info, config)
+    if not messages:
+        print("No owners to notify (owners lookup disabled or no expiring credentials with owners)")
+        return True
+    if dry_run:
+        print(f"Dry run, {len(messages)} owner notifications not sent: {', '.join(r[0] for r, _ in messages)}")
+        return True
     
-    print(f"Found {len(app_info)} application registrations, generating report...")
-    html_report, text_report = generate_report(app_info)
+    print(f"Sending {len(messages)} owner notifications...")
+    failures = deliver(messages, config["email"], config["email"].get("max_workers", 4))
+    for recipients, error in failures:
+        print(f"Error sending owner notification to {', '.join(recipients)}: {str(error)}")
+    print(f"Sent {len(messages) - len(failures)} of {len(messages)} owner notifications")
+    return not failures
+
+def save_snapshot(app_info, path):
+    """
+    Save every record of the scan, so the report can be regenerated offline
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([record.to_dict() for record in app_info], f, ensure_ascii=False, indent=2)
+    print(f"Saved {len(app_info)} records to snapshot {path}")
+
+def load_snapshot(path):
+    """
+    Records from a saved snapshot; days to expire are recomputed for today
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = json.load(f)
+    now = run_clock()
+    return [CredentialRecord.from_dict(row, now) for row in rows]
+
+def deliver_report(app_info, config, dry_run=False):
+    """
+    Mail the report, or print it when email is not configured or on a dry run.
+    config["report"] selects a digest and the compressed CSV inventory attachment.
+    """
+    report_config = config.get("report", {})
+    attachments = []
+    if report_config.get("attach_inventory", False):
+        filename = f"app_registrations_{datetime.datetime.now().strftime('%Y%m%d')}.csv.gz"
+        attachments.append((filename, build_inventory_csv(app_info)))
+    html_report, text_report = generate_report(
+        app_info,
+        config.get("warning_days", 30),
+        digest=report_config.get("mode", "full") == "digest",
+        attachment=attachments[0][0] if attachments else None
+    )
     
+    if dry_run:
+        for filename, content in attachments:
+            print(f"Attachment {filename}: {len(content)} bytes")
+        print(f"HTML report: {len(html_report.encode('utf-8'))} bytes")
+        print("Dry run, email not sent. Displaying text report:\n")
+        print(text_report)
     # Check if email configuration exists before attempting to send email
-    if "email" in config and config["email"].get("recipients"):
+    elif "email" in config and config["email"].get("recipients"):
         print("Sending email...")
-        if not send_email(html_report, text_report, config):
+        if not send_email(html_report, text_report, config, attachments):
             print("\nEmail sending failed. Displaying text report:\n")
             print(text_report)
     else:
         print("Email configuration or recipients not found in config.json.")
         print("\nDisplaying text report:\n")
         print(text_report)
+    
+    if (config.get("email") or {}).get("owner_notifications"):
+        notify_owners(app_info, config, dry_run)
+
+async def run_check(config, snapshot=None, dry_run=False):
+    """
+    Scan every tenant, record the history, then mail (or print) the report
+    """
+    if dry_run:
+        describe_scan(config)
+        recipients = (config.get("email") or {}).get("recipients")
+        print(f"Email recipients: {', '.join(recipients) if recipients else 'not configured'} (not sent)")
+        return
+    
+    print("Getting Azure application registration information...")
+    results = await scan_tenants(config, scan_tenant)
+    app_info = [record for records in results.values() if records for record in records]
+    
+    if not app_info:
+        print("No application registration information found or error occurred during retrieval")
+        return
+    
+    if snapshot:
+        save_snapshot(app_info, snapshot)
+    
+    store = open_history_store(config, SCRIPT_DIR)
+    if store:
+        try:
+            store.begin_run()
+            store.add_credentials(app_info)
+            print_history_summary(store, config.get("warning_days", 30))
+        finally:
+            store.close()
+    
+    print(f"Found {len(app_info)} application registrations, generating report...")
+    deliver_report(app_info, config)
+
+def parse_args(argv=None):
+    parser, commands = build_parser("Check Azure application registration credentials and mail a report", CONFIG_PATH)
+    scan = add_command(commands, "scan", "Scan the tenants and mail the report (default)")
+    scan.add_argument("--snapshot", help="Also save all records to this JSON file for offline reports")
+    report = add_command(commands, "report", "Regenerate and mail the report from a saved snapshot, offline")
+    report.add_argument("snapshot", help="JSON file saved by scan --snapshot")
+    return parser.parse_args(argv)
+
+async def async_main(args):
+    """
+    Async main function
+    """
+    config = load_config(args.config)
+    if config is None:
+        return 1
+    
+    if args.command == "report":
+        app_info = load_snapshot(args.snapshot)
+        print(f"Loaded {len(app_info)} records from {args.snapshot}, generating report...")
+        deliver_report(app_info, config, args.dry_run)
+        return 0
+    
+    if not check_config(config):
+        return 1
+    await run_check(config, getattr(args, "snapshot", None), args.dry_run)
+    return 0
 
 def main():
     """
-    Main function - start async run
+    Main function - parse the command line and start async run
     """
-    asyncio.run(async_main())
+    args = parse_args()
+    sys.exit(asyncio.run(async_main(args)))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
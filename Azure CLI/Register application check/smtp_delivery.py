@@ -0,0 +1,92 @@
+"""
+Reused, authenticated SMTP connections for sending many messages
+"""
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Errors after which the connection is reopened and the message sent again
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+class SmtpSession:
+    """
+    One STARTTLS + login connection to config["smtp_server"], kept open for
+    every message sent through it and reopened once if the server drops it
+    """
+
+    def __init__(self, email_config):
+        self.config = email_config
+        self.server = None
+
+    def connect(self):
+        server = smtplib.SMTP(self.config["smtp_server"], self.config["smtp_port"], timeout=self.config.get("timeout", 60))
+        try:
+            server.ehlo()  # Say hello to the server
+            server.starttls()  # Start TLS encryption
+            server.ehlo()  # Say hello again after TLS
+            server.login(self.config["sender"], self.config["password"])
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+
+    def send(self, message, recipients):
+        for attempt in range(2):
+            if self.server is None:
+                self.connect()
+            try:
+                self.server.sendmail(self.config["sender"], recipients, message.as_string())
+                return
+            except RECONNECT_ERRORS:
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self):
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+        self.server = None
+
+def deliver(messages, email_config, workers=4):
+    """
+    Send (recipients, message) pairs over at most workers connections, each
+    reused for all the messages its thread sends. A failed login stops the
+    remaining messages instead of retrying it for each of them.
+    Returns the (recipients, error) of the messages that were not sent.
+    """
+    local = threading.local()
+    sessions = []
+    lock = threading.Lock()
+    login_failed = threading.Event()
+
+    def send(recipients, message):
+        if login_failed.is_set():
+            raise smtplib.SMTPAuthenticationError(535, b"Skipped after an earlier authentication failure")
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = SmtpSession(email_config)
+            with lock:
+                sessions.append(session)
+        try:
+            session.send(message, recipients)
+        except smtplib.SMTPAuthenticationError:
+            login_failed.set()
+            raise
+
+    failures = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(send, recipients, message): recipients for recipients, message in messages}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append((futures[future], e))
+    finally:
+        for session in sessions:
+            session.close()
+    return failures
@@ -0,0 +1,50 @@
+"""
+Multi-tenant configuration and concurrent scanning for the app registration checkers
+"""
+import asyncio
+import traceback
+
+def tenant_name(azure_config):
+    return azure_config.get("name") or azure_config["tenant_id"]
+
+def tenant_configs(config):
+    """
+    One config per tenant. "tenants" lists tenants with their own credentials;
+    a config with only "azure" is a single tenant, as before.
+    """
+    tenants = config.get("tenants")
+    if not tenants:
+        return [dict(config, tenant=tenant_name(config["azure"]))]
+
+    configs = []
+    for tenant in tenants:
+        name = tenant_name(tenant)
+        # Each tenant keeps its own delta token and snapshot
+        configs.append(dict(config, azure=tenant, tenant=name, delta_state_file=f"delta_state_{name}.json"))
+    return configs
+
+async def scan_tenants(config, scan):
+    """
+    Run scan(tenant_config) for every tenant concurrently, at most
+    config["tenant_concurrency"] tenants at a time. A failing tenant is
+    reported and skipped without affecting the others.
+    Returns {tenant name: scan result, or None if it failed}
+    """
+    slots = asyncio.Semaphore(config.get("tenant_concurrency", 4))
+
+    async def run(tenant_config):
+        name = tenant_config["tenant"]
+        async with slots:
+            try:
+                return name, await scan(tenant_config)
+            # get_azure_credentials exits on bad credentials; only this tenant should stop
+            except (Exception, SystemExit) as e:
+                print(f"Error scanning tenant {name}: {str(e)}")
+                traceback.print_exc()
+                return name, None
+
+    results = dict(await asyncio.gather(*(run(tenant_config) for tenant_config in tenant_configs(config))))
+    failed = [name for name, result in results.items() if result is None]
+    if failed:
+        print(f"Scan failed for {len(failed)} of {len(results)} tenants: {', '.join(failed)}")
+    return results
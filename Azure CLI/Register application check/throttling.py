@@ -0,0 +1,133 @@
+"""
+Adaptive rate limiting for Graph requests shared by the app registration checkers:
+a token bucket that slows down when Graph throttles and speeds up again afterwards
+"""
+import asyncio
+import email.utils
+import time
+import weakref
+import httpx
+
+# Graph signals throttling with 429, and sometimes 503 when a service is overloaded
+THROTTLE_STATUS = {429, 503}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_limiters = weakref.WeakKeyDictionary()
+
+def retry_after(headers, attempt):
+    """
+    Seconds to wait before retrying: the Retry-After header (seconds or an
+    HTTP date) when present, otherwise exponential backoff
+    """
+    value = httpx.Headers(headers or {}).get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return float(min(2 ** attempt, 60))
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by every Graph request of one tenant.
+    The rate is halved on each throttled response and all callers pause for
+    its Retry-After; every successful response raises it again by a small
+    step, up to max_rate (additive increase, multiplicative decrease).
+    A request may cost several tokens (a $batch call counts its sub-requests).
+    """
+
+    def __init__(self, rate=10.0, max_rate=50.0, min_rate=0.5, increase=0.1, max_retries=5):
+        self.rate = rate
+        self.max_rate = max(max_rate, rate)
+        self.min_rate = min_rate
+        self.increase = increase
+        self.max_retries = max_retries
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        # Allow bursts of up to one second of requests
+        self._tokens = min(max(self.rate, 1.0), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens=1):
+        """
+        Wait until a request costing tokens may be sent.
+        Callers are served in arrival order; a large request leaves the bucket in
+        debt, which later callers wait out.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttled(self, delay):
+        """
+        Back off: halve the rate and hold every caller for delay seconds
+        """
+        self.rate = max(self.min_rate, self.rate / 2)
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + delay)
+        self._tokens = min(self._tokens, 0.0)
+        self._updated = now
+
+def get_rate_limiter(credentials, settings=None):
+    """
+    The limiter for the tenant behind credentials, created on first use from
+    settings (config["throttling"]); the Graph client and $batch lookups of a
+    tenant therefore share one budget
+    """
+    limiter = _limiters.get(credentials)
+    if limiter is None:
+        settings = settings or {}
+        limiter = AdaptiveRateLimiter(
+            rate=settings.get("requests_per_second", 10.0),
+            max_rate=settings.get("max_requests_per_second", 50.0),
+            max_retries=settings.get("max_retries", 5)
+        )
+        _limiters[credentials] = limiter
+    return limiter
+
+class ThrottledTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that sends every request through a rate limiter and
+    retries idempotent requests that Graph throttled
+    """
+
+    def __init__(self, limiter, transport):
+        self.limiter = limiter
+        self.transport = transport
+
+    async def handle_async_request(self, request):
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            response = await self.transport.handle_async_request(request)
+            if response.status_code not in THROTTLE_STATUS:
+                self.limiter.on_success()
+                return response
+
+            # The limiter pause makes the next acquire wait out Retry-After
+            self.limiter.on_throttled(retry_after(response.headers, attempt))
+            if request.method not in IDEMPOTENT_METHODS or attempt >= self.limiter.max_retries:
+                return response
+            await response.aclose()
+            attempt += 1
+
+    async def aclose(self):
+        await self.transport.aclose()
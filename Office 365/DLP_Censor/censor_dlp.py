@@ -1,161 +1,441 @@
+import codecs
+import csv
+import glob
+import heapq
+import itertools
+import math
 import json
+import numpy as np
 import pandas as pd
 import os
 import re
-from collections import defaultdict
-from jinja2 import Template
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from jinja2 import Environment, FileSystemBytecodeCache, FunctionLoader
 from datetime import datetime
 
-def parse_dlp_logs(log_file):
-    """解析DLP日志文件，区分OneDrive和EXO类型的日志"""
-    # 读取CSV文件
-    try:
-        df = pd.read_csv(log_file, encoding='utf-8')
-    except UnicodeDecodeError:
-        # 如果UTF-8解码失败，尝试其他编码
-        df = pd.read_csv(log_file, encoding='gbk')
+# AuditData 中报告用到的字段：时间、规则名称、Workload、文件名、主题、发件人
+_NO_SENDER = object()
+_audit_decoder = None
+
+# 日志明细的列，与模板中的字段对应
+LOG_COLUMNS = {
+    'onedrive': ['时间', '规则名称', 'UserID', '文件名'],
+    'exo': ['时间', '规则名称', 'UserID', '主题']
+}
+
+def get_audit_decoder():
+    """
+    按 schema 只解析报告需要字段的 msgspec 解码器，进程内只构建一次；
+    未安装 msgspec 时返回 None，改用 json 解析
+    """
+    global _audit_decoder
+    if _audit_decoder is None:
+        try:
+            import msgspec
+        except ImportError:
+            _audit_decoder = False
+            return None
+        from typing import List, Optional, Union
+
+        Text = Optional[str]
+
+        class Rule(msgspec.Struct):
+            RuleName: Text = ''
+
+        class Policy(msgspec.Struct):
+            Rules: Optional[List[Rule]] = None
+
+        class SharePointMeta(msgspec.Struct):
+            FileName: Text = ''
+
+        class ExchangeMeta(msgspec.Struct):
+            Subject: Text = ''
+            # 区分没有 From 和 From 为 null
+            From: Union[Text, msgspec.UnsetType] = msgspec.UNSET
+
+        class AuditData(msgspec.Struct):
+            CreationTime: Text = ''
+            RuleName: Union[Text, msgspec.UnsetType] = msgspec.UNSET
+            PolicyDetails: Optional[List[Policy]] = None
+            Workload: Text = ''
+            SharePointMetaData: Optional[SharePointMeta] = None
+            ExchangeMetaData: Optional[ExchangeMeta] = None
+
+        def fields(blob):
+            audit = decoder.decode(blob)
+            rule_name = audit.RuleName
+            if rule_name is msgspec.UNSET:
+                rule_name = ''
+                for policy in audit.PolicyDetails or ():
+                    if policy.Rules:
+                        rule_name = policy.Rules[0].RuleName
+                        break
+            sharepoint = audit.SharePointMetaData
+            exchange = audit.ExchangeMetaData
+            sender = _NO_SENDER
+            if exchange and exchange.From is not msgspec.UNSET:
+                sender = exchange.From
+            return (
+                audit.CreationTime,
+                rule_name,
+                audit.Workload,
+                sharepoint.FileName if sharepoint else '',
+                exchange.Subject if exchange else '',
+                sender
+            )
+
+        decoder = msgspec.json.Decoder(AuditData)
+        _audit_decoder = (fields, msgspec.DecodeError)
+    return _audit_decoder or None
+
+def _audit_fields(blob):
+    """用 json 解析一条 AuditData，取出与解码器相同的字段"""
+    audit_data = json.loads(blob)
     
-    # 初始化数据结构
-    onedrive_logs = []
-    exo_logs = []
+    # 获取规则名称
+    rule_name = ''
+    if 'RuleName' in audit_data:
+        rule_name = audit_data['RuleName']
+    elif audit_data.get('PolicyDetails'):
+        for policy in audit_data['PolicyDetails']:
+            if policy.get('Rules'):
+                rule_name = policy['Rules'][0].get('RuleName', '')
+                break
     
-    # 规则和用户计数器
-    onedrive_rule_counts = defaultdict(int)
-    onedrive_user_counts = defaultdict(int)
-    exo_rule_counts = defaultdict(int)
-    exo_user_counts = defaultdict(int)
+    sharepoint = audit_data.get('SharePointMetaData')
+    exchange = audit_data.get('ExchangeMetaData')
+    return (
+        audit_data.get('CreationTime', ''),
+        rule_name,
+        audit_data.get('Workload', ''),
+        sharepoint.get('FileName', '') if sharepoint else '',
+        exchange.get('Subject', '') if exchange else '',
+        exchange.get('From', _NO_SENDER) if exchange else _NO_SENDER
+    )
+
+def decode_audit_data(values):
+    """
+    把 AuditData 列解码为按列组织的字段，返回 (行号, 时间, 规则名称, Workload, 文件名, 主题, 发件人)
+    七个列表；无法解析的行被跳过
+    """
+    decoder = get_audit_decoder()
+    if decoder:
+        decode, schema_errors = decoder
+    else:
+        decode, schema_errors = _audit_fields, ()
     
-    # 处理每一行数据
-    for _, row in df.iterrows():
-        # 解析AuditData列中的JSON数据
-        if isinstance(row['AuditData'], str):
+    positions = []
+    decoded = []
+    for position, blob in enumerate(values):
+        if not isinstance(blob, str):
+            continue
+        try:
+            decoded.append(decode(blob))
+        except schema_errors:
+            # 不符合 schema 的记录（字段类型不同等）交给 json 解析
             try:
-                audit_data = json.loads(row['AuditData'])
-            except json.JSONDecodeError:
-                print(f"警告: 无法解析AuditData JSON: {row['AuditData'][:100]}...")
+                decoded.append(_audit_fields(blob))
+            except (json.JSONDecodeError, AttributeError, TypeError):
+                print(f"警告: 无法解析AuditData JSON: {blob[:100]}...")
                 continue
+        except (json.JSONDecodeError, AttributeError, TypeError):
+            print(f"警告: 无法解析AuditData JSON: {blob[:100]}...")
+            continue
+        positions.append(position)
+    
+    if not decoded:
+        return [[] for _ in range(7)]
+    return [positions] + [list(column) for column in zip(*decoded)]
+
+class HeavyHitters:
+    """
+    内存固定的近似计数（可合并的 Misra-Gries / Space-Saving 摘要），最多保留 ceil(1/error_rate) 项。
+    每项的计数可能偏小，但偏差不超过 error_rate × 总次数，出现次数超过该值的项一定被保留
+    """
+
+    def __init__(self, error_rate=0.001):
+        self.error_rate = error_rate
+        self.capacity = math.ceil(1 / error_rate)
+        self.counts = {}
+        self.total = 0
+        # 已从每项计数中扣除的最大值，即计数误差的上限
+        self.error = 0
+
+    def update(self, counts):
+        """累加另一个计数（Counter、字典或 HeavyHitters）"""
+        if isinstance(counts, HeavyHitters):
+            self.total += counts.total
+            self.error += counts.error
+            counts = counts.counts
         else:
-            audit_data = row['AuditData']
+            self.total += sum(counts.values())
+        for item, count in counts.items():
+            self.counts[item] = self.counts.get(item, 0) + count
         
-        # 获取用户ID
-        user_id = row.get('UserId', '')
-        
-        # 获取创建时间
-        creation_time = audit_data.get('CreationTime', '')
-        
-        # 获取规则名称
-        rule_name = ''
-        if 'RuleName' in audit_data:
-            rule_name = audit_data['RuleName']
-        elif 'PolicyDetails' in audit_data and audit_data['PolicyDetails']:
-            for policy in audit_data['PolicyDetails']:
-                if 'Rules' in policy and policy['Rules']:
-                    rule_name = policy['Rules'][0].get('RuleName', '')
-                    break
-        
-        # 检查Workload字段，区分OneDrive和Exchange(EXO)
-        workload = ''
-        if 'Workload' in audit_data:
-            workload = audit_data['Workload']
-        
-        # 根据Workload分类
-        if workload == 'OneDrive':
-            # OneDrive类型的日志
-            file_name = ''
-            if 'SharePointMetaData' in audit_data and audit_data['SharePointMetaData']:
-                file_name = audit_data['SharePointMetaData'].get('FileName', '')
-            
-            # 添加到OneDrive日志列表
-            onedrive_logs.append({
-                '时间': creation_time,
-                '规则名称': rule_name,
-                'UserID': user_id,
-                '文件名': file_name
-            })
-            
-            # 更新计数器
-            onedrive_rule_counts[rule_name] += 1
-            onedrive_user_counts[user_id] += 1
-            
-        elif workload == 'Exchange':
-            # EXO类型的日志
-            subject = ''
-            exchange_user_id = user_id
-            if 'ExchangeMetaData' in audit_data and audit_data['ExchangeMetaData']:
-                subject = audit_data['ExchangeMetaData'].get('Subject', '')
-                # 从ExchangeMetaData的From字段获取用户ID
-                if 'From' in audit_data['ExchangeMetaData']:
-                    exchange_user_id = audit_data['ExchangeMetaData'].get('From', user_id)
-            
-            # 添加到EXO日志列表
-            exo_logs.append({
-                '时间': creation_time,
-                '规则名称': rule_name,
-                'UserID': exchange_user_id,
-                '主题': subject
-            })
-            
-            # 更新计数器
-            exo_rule_counts[rule_name] += 1
-            exo_user_counts[exchange_user_id] += 1
+        if len(self.counts) > self.capacity:
+            # 所有计数减去第 capacity+1 大的计数，只留下仍为正数的项
+            cut = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+            self.counts = {item: count - cut for item, count in self.counts.items() if count > cut}
+            self.error += cut
+
+    def items(self):
+        return self.counts.items()
+
+    def __len__(self):
+        return len(self.counts)
+
+def new_counter(error_rate=None):
+    """规则/用户计数：默认精确计数，指定 error_rate 时为内存固定的近似计数"""
+    return HeavyHitters(error_rate) if error_rate else Counter()
+
+def detect_encoding(log_file, sample_size=1 << 20):
+    """读取文件开头的样本判断编码：能按 UTF-8 解码则为 utf-8，否则为 gbk"""
+    with open(log_file, 'rb') as f:
+        sample = f.read(sample_size)
+    try:
+        # 样本末尾可能截断在多字节字符中间，用增量解码器忽略这部分
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'gbk'
+
+class SpilledLogs:
+    """写到磁盘 CSV 文件中的日志明细，迭代时逐行读回为字典"""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+        self.count = 0
+        # 创建（或清空）文件
+        open(path, 'w', encoding='utf-8').close()
+
+    def append(self, logs):
+        if len(logs):
+            logs.to_csv(self.path, mode='a', header=False, index=False, encoding='utf-8')
+            self.count += len(logs)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.reader(f):
+                yield dict(zip(self.columns, row))
+
+def stream_dlp_logs(log_file, spill_dir, chunk_size=200000, error_rate=None):
+    """
+    按块流式解析DLP日志文件：编码只检测一次，规则/用户计数逐块累加，
+    日志明细写入 spill_dir 下的文件，内存占用与文件大小无关。
+    error_rate 见 new_counter
+    """
+    encoding = detect_encoding(log_file)
+    try:
+        return _stream_dlp_logs(log_file, spill_dir, chunk_size, encoding, error_rate)
+    except UnicodeDecodeError:
+        if encoding != 'utf-8':
+            raise
+        # 样本之后才出现非 UTF-8 内容，按 GBK 重新读取
+        print("警告: 文件中存在非UTF-8内容，改用GBK重新解析")
+        return _stream_dlp_logs(log_file, spill_dir, chunk_size, 'gbk', error_rate)
+
+def _stream_dlp_logs(log_file, spill_dir, chunk_size, encoding, error_rate):
+    data = {
+        report_type: {
+            'logs': SpilledLogs(os.path.join(spill_dir, f"{report_type}_logs.csv"), columns),
+            'rule_counts': new_counter(error_rate),
+            'user_counts': new_counter(error_rate)
+        }
+        for report_type, columns in LOG_COLUMNS.items()
+    }
     
-    # 返回处理结果
+    # 只读取用到的两列
+    chunks = pd.read_csv(log_file, encoding=encoding, chunksize=chunk_size,
+                         usecols=lambda column: column in ('UserId', 'AuditData'))
+    for df in chunks:
+        for report_type, chunk_data in build_results(df).items():
+            data[report_type]['logs'].append(chunk_data['logs'])
+            data[report_type]['rule_counts'].update(chunk_data['rule_counts'])
+            data[report_type]['user_counts'].update(chunk_data['user_counts'])
+    return data
+
+class LogSegments:
+    """按顺序拼接的多段日志明细（每个导出文件一段）"""
+
+    def __init__(self, segments):
+        self.segments = segments
+
+    def __len__(self):
+        return sum(len(segment) for segment in self.segments)
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.segments)
+
+def find_log_files(log_source):
+    """log_source 可以是单个CSV文件、目录（其中所有 .csv 文件）或通配符，按文件名排序返回"""
+    if os.path.isdir(log_source):
+        files = glob.glob(os.path.join(log_source, '*.csv'))
+    elif glob.has_magic(log_source):
+        files = glob.glob(log_source)
+    else:
+        files = [log_source]
+    if not files:
+        raise FileNotFoundError(f"未找到DLP日志文件: {log_source}")
+    return sorted(files)
+
+def _parse_part(log_file, spill_dir, chunk_size, error_rate):
+    # 在子进程中解析一个文件，明细写入单独的目录
+    os.makedirs(spill_dir, exist_ok=True)
+    return stream_dlp_logs(log_file, spill_dir, chunk_size, error_rate)
+
+def merge_results(parts, error_rate=None):
+    """按文件顺序合并各文件的部分结果，与依次解析这些文件得到的结果相同"""
+    data = {}
+    for report_type in LOG_COLUMNS:
+        rule_counts = new_counter(error_rate)
+        user_counts = new_counter(error_rate)
+        for part in parts:
+            rule_counts.update(part[report_type]['rule_counts'])
+            user_counts.update(part[report_type]['user_counts'])
+        data[report_type] = {
+            'logs': LogSegments([part[report_type]['logs'] for part in parts]),
+            'rule_counts': rule_counts,
+            'user_counts': user_counts
+        }
+    return data
+
+def parse_dlp_files(log_source, spill_dir, chunk_size=200000, workers=None, error_rate=None):
+    """
+    解析一个或多个DLP日志导出文件（见 find_log_files），多个文件时在进程池中并行解析，
+    workers 默认为 CPU 核数；error_rate 见 new_counter
+    """
+    log_files = find_log_files(log_source)
+    if len(log_files) == 1:
+        return stream_dlp_logs(log_files[0], spill_dir, chunk_size, error_rate)
+    
+    spill_dirs = [os.path.join(spill_dir, f"part{index:04d}") for index in range(len(log_files))]
+    workers = min(workers or os.cpu_count() or 1, len(log_files))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = list(executor.map(_parse_part, log_files, spill_dirs,
+                                  itertools.repeat(chunk_size), itertools.repeat(error_rate)))
+    return merge_results(parts, error_rate)
+
+def iter_log_records(logs):
+    """逐条返回日志明细，支持内存中的 DataFrame 和落盘的 SpilledLogs"""
+    if isinstance(logs, pd.DataFrame):
+        return logs.to_dict('records')
+    return iter(logs)
+
+def _blank_nulls(values):
+    """JSON null 和空的 UserId（NaN）统一为空字符串"""
+    values = np.array(values, dtype=object)
+    values[pd.isna(values)] = ''
+    return values
+
+def build_results(df):
+    """
+    从日志 DataFrame 按列构建 OneDrive 和 EXO 的日志明细与规则/用户计数；
+    缺失值统一为空字符串，内存中的明细与落盘后读回的明细完全相同
+    """
+    positions, times, rules, workloads, file_names, subjects, senders = decode_audit_data(df['AuditData'].tolist())
+    user_ids = df['UserId'].to_numpy(dtype=object)[positions] if 'UserId' in df else np.full(len(positions), '', dtype=object)
+    
+    times = _blank_nulls(times)
+    rules = _blank_nulls(rules)
+    user_ids = _blank_nulls(user_ids)
+    workloads = np.array(workloads, dtype=object)
+    
+    # OneDrive类型的日志
+    onedrive = workloads == 'OneDrive'
+    onedrive_logs = pd.DataFrame(dict(zip(LOG_COLUMNS['onedrive'], [
+        times[onedrive],
+        rules[onedrive],
+        user_ids[onedrive],
+        _blank_nulls(file_names)[onedrive]
+    ])), dtype=object)
+    
+    # EXO类型的日志，用户ID取自ExchangeMetaData的From字段
+    exo = workloads == 'Exchange'
+    senders = np.array(senders, dtype=object)
+    exo_user_ids = _blank_nulls(np.where(senders == _NO_SENDER, user_ids, senders)[exo]) if len(senders) else user_ids[exo]
+    exo_logs = pd.DataFrame(dict(zip(LOG_COLUMNS['exo'], [
+        times[exo],
+        rules[exo],
+        exo_user_ids,
+        _blank_nulls(subjects)[exo]
+    ])), dtype=object)
+    
+    # 计数器按首次出现的顺序记录，与逐行累加的结果相同
     return {
         'onedrive': {
             'logs': onedrive_logs,
-            'rule_counts': onedrive_rule_counts,
-            'user_counts': onedrive_user_counts
+            'rule_counts': Counter(onedrive_logs['规则名称'].tolist()),
+            'user_counts': Counter(onedrive_logs['UserID'].tolist())
         },
         'exo': {
             'logs': exo_logs,
-            'rule_counts': exo_rule_counts,
-            'user_counts': exo_user_counts
+            'rule_counts': Counter(exo_logs['规则名称'].tolist()),
+            'user_counts': Counter(exo_logs['UserID'].tolist())
         }
     }
 
 def generate_top_items(counts_dict, limit=10):
     """生成排名前N的项目列表"""
-    # 按计数降序排序
-    sorted_items = sorted(counts_dict.items(), key=lambda x: x[1], reverse=True)
+    # 用堆只选出计数最大的N项，计数相同时保持原有顺序（与完整排序后取前N项相同）
+    top_items = heapq.nlargest(limit, counts_dict.items(), key=itemgetter(1))
     
     # 返回前N个项目，每个项目包含排名、名称和计数
     return [{'排名': i+1, '名称': item[0], '计数': item[1]} 
-            for i, item in enumerate(sorted_items[:limit])]
+            for i, item in enumerate(top_items)]
+
+_template_environment = None
+
+def get_template_environment():
+    """
+    报告模板环境，进程内只创建一次：模板按报告类型（onedrive/exo）加载并缓存编译结果，
+    编译后的字节码还缓存在临时目录中，下次运行时不再重新编译
+    """
+    global _template_environment
+    if _template_environment is None:
+        # 模板内容由代码生成，不会在运行中变化
+        loader = FunctionLoader(lambda report_type: (create_html_template(report_type), None, lambda: True))
+        _template_environment = Environment(loader=loader, bytecode_cache=FileSystemBytecodeCache())
+    return _template_environment
 
-def generate_html_report(data, report_type, month):
-    """根据数据和报告类型生成HTML报告"""
-    # 确定报告标题和模板
+def report_context(data, report_type, month):
+    """报告模板的变量：标题、生成时间、前10名规则和用户、日志明细"""
+    # 确定报告标题
     if report_type == 'onedrive':
         title = f"O365 OneDrive {month}月 DLP Review"
-        template_file = "onedrive_template.html"
     else:  # exo
         title = f"O365 EXO {month}月 DLP Review"
-        template_file = "exo_template.html"
-    
-    # 生成前10名规则和用户
-    top_rules = generate_top_items(data[report_type]['rule_counts'])
-    top_users = generate_top_items(data[report_type]['user_counts'])
-    
-    # 获取日志详情
-    logs = data[report_type]['logs']
-    
-    # 创建HTML模板
-    template_content = create_html_template(report_type, title)
-    template = Template(template_content)
     
-    # 渲染模板
-    html = template.render(
-        title=title,
-        generated_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        top_rules=top_rules,
-        top_users=top_users,
-        logs=logs
-    )
-    
-    # 返回生成的HTML内容
-    return html
+    return {
+        'title': title,
+        'generated_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        # 生成前10名规则和用户
+        'top_rules': generate_top_items(data[report_type]['rule_counts']),
+        'top_users': generate_top_items(data[report_type]['user_counts']),
+        # 获取日志详情
+        'logs': iter_log_records(data[report_type]['logs'])
+    }
+
+def write_html_report(data, report_type, month, output_file):
+    """
+    生成HTML报告并边渲染边写入文件，不在内存中保存完整的HTML，
+    日志明细很多时也只占用少量内存
+    """
+    template = get_template_environment().get_template(report_type)
+    stream = template.stream(report_context(data, report_type, month))
+    # 每次写入约100段渲染结果
+    stream.enable_buffering(100)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        stream.dump(f)
+    print(f"The report has been saved to: {output_file}")
 
-def create_html_template(report_type, title):
+def create_html_template(report_type):
     """创建HTML模板"""
     # 基础模板
     template = '''
@@ -309,47 +589,52 @@ def create_html_template(report_type, title):
     
     return template
 
-def save_html_report(html_content, output_file):
-    """保存HTML报告到文件"""
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    print(f"The report has been saved to: {output_file}")
-
-def main():
-    # 获取当前月份
-    current_month = datetime.now().strftime('%m')
-    
-    # 输入文件路径
-    log_file = r""
-    
-    # 解析日志
-    print("DLP logs are being parsed...")
-    data = parse_dlp_logs(log_file)
-    
+def generate_reports(data, current_month, output_dir):
+    """生成并保存OneDrive和EXO的报告"""
     # 检查是否有OneDrive和EXO日志
     has_onedrive = len(data['onedrive']['logs']) > 0
     has_exo = len(data['exo']['logs']) > 0
     
-    # 输出目录
-    output_dir = r"outputpath"
-    
     # 生成并保存报告
     if has_onedrive:
         print("OneDrive DLP reports are being generated...")
-        onedrive_html = generate_html_report(data, 'onedrive', current_month)
         onedrive_output = os.path.join(output_dir, f"O365_OneDrive_{current_month}月_DLP_Review.html")
-        save_html_report(onedrive_html, onedrive_output)
+        write_html_report(data, 'onedrive', current_month, onedrive_output)
     
     if has_exo:
         print("EXO DLP report is being generated...")
-        exo_html = generate_html_report(data, 'exo', current_month)
         exo_output = os.path.join(output_dir, f"O365_EXO_{current_month}月_DLP_Review.html")
-        save_html_report(exo_html, exo_output)
+        write_html_report(data, 'exo', current_month, exo_output)
     
     if not has_onedrive and not has_exo:
         print("WARNING: No OneDrive or EXO-related DLP logs found")
+
+def main():
+    # 获取当前月份
+    current_month = datetime.now().strftime('%m')
+    
+    # 输入：单个CSV文件、包含多个导出文件的目录，或通配符（如 r"exports\*.csv"）
+    log_source = r""
+    
+    # 并行解析的进程数，None 表示使用全部CPU核心
+    workers = None
+    
+    # 输出目录
+    output_dir = r"outputpath"
+    
+    # 排名的计数方式：None 为精确计数；用户数量极多时可设为如 0.0001，
+    # 用固定内存近似计数，计数误差不超过该比例 × 日志条数
+    error_rate = None
+    
+    # 每次读取的行数，日志明细暂存到临时目录，大文件也不会占满内存
+    chunk_size = 200000
+    with tempfile.TemporaryDirectory(prefix="dlp_") as spill_dir:
+        # 解析日志
+        print("DLP logs are being parsed...")
+        data = parse_dlp_files(log_source, spill_dir, chunk_size, workers, error_rate)
+        generate_reports(data, current_month, output_dir)
     
     print("Done!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()